@@ -3,11 +3,24 @@
 https://adventofcode.com/2020/day/1
 
 """
+import io
 import itertools
 import operator
+import random
+import sys
 from functools import reduce
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc.inputs import InputFile  # noqa: E402
+from aoc.ints import integers  # noqa: E402
 
 
 def main() -> None:
@@ -22,20 +35,249 @@ def main() -> None:
 
 
 def get_entries() -> List[int]:
-    input_file = Path(__file__).parent / "input"
-    text = input_file.read_text()
-    split = text.split()
-    entries = [int(entry) for entry in split]
-    return entries
+    with InputFile(Path(__file__).parent / "input") as f:
+        return integers(f.buffer).tolist()
+
+
+def parse_entries(text: str) -> List[int]:
+    return integers(text).tolist()
+
+
+def read_entries(f: TextIO) -> Iterator[int]:
+    """Entries one line at a time, for reports that arrive as a stream."""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield int(line)
+
+
+TARGET = 2020
+
+
+def two_sums(entries: Iterable[int], target: int = TARGET) -> Iterator[Tuple[int, int]]:
+    """Pairs of entries adding up to ``target``, each pair of values once.
+
+    One pass with a set of the values seen so far, so a pair is found as soon
+    as its second entry is.
+
+    """
+    seen = set()
+    found = set()
+    for value in entries:
+        other = target - value
+        if other in seen:
+            pair = (other, value) if other <= value else (value, other)
+            if pair not in found:
+                found.add(pair)
+                yield pair
+        seen.add(value)
+
+
+def _sorted_sums(
+    values: List[int], start: int, k: int, target: int,
+) -> Iterator[Tuple[int, ...]]:
+    """k-sums from ``values[start:]``, which is sorted, in ascending order."""
+    end = len(values)
+    if k == 2:
+        lo, hi = start, end - 1
+        while lo < hi:
+            total = values[lo] + values[hi]
+            if total < target:
+                lo += 1
+            elif total > target:
+                hi -= 1
+            else:
+                yield values[lo], values[hi]
+                low, high = values[lo], values[hi]
+                while lo < hi and values[lo] == low:
+                    lo += 1
+                while lo < hi and values[hi] == high:
+                    hi -= 1
+        return
+
+    largest = sum(values[end - (k - 1):])
+    for i in range(start, end - k + 1):
+        value = values[i]
+        if i > start and value == values[i - 1]:
+            continue
+        # the smallest sum left is already too big, and it only grows
+        if value + sum(values[i + 1:i + k]) > target:
+            return
+        # even the largest values left can't reach the target
+        if value + largest < target:
+            continue
+        for rest in _sorted_sums(values, i + 1, k - 1, target - value):
+            yield (value,) + rest
+
+
+def k_sums(entries: Iterable[int], k: int, target: int = TARGET) -> Iterator[Tuple[int, ...]]:
+    """Every set of ``k`` entries adding up to ``target``, as sorted values.
+
+    Each combination of values comes up once, however many entries share
+    them. Pairs use a hash set, O(n). Anything bigger sorts the entries and
+    fixes one value at a time down to a two-pointer scan, O(n^(k-1)).
+
+    """
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+    if k == 1:
+        if target in set(entries):
+            yield (target,)
+        return
+    if k == 2:
+        for pair in two_sums(entries, target):
+            yield pair
+        return
+    yield from _sorted_sums(sorted(entries), 0, k, target)
+
+
+def find_sum(entries: Iterable[int], k: int, target: int = TARGET) -> Optional[Tuple[int, ...]]:
+    """The first set of ``k`` entries adding up to ``target``, without looking for more."""
+    return next(k_sums(entries, k, target), None)
+
+
+def _bounded_sums(
+    entries: Iterable[int], k: int, target: int, lo: int, hi: int,
+) -> Iterator[Tuple[int, ...]]:
+    size = hi - lo + 1
+    # how many times each value has come up, capped at 2
+    counts = bytearray(size)
+    seen = np.frombuffer(counts, dtype=np.uint8)
+    # pair_sums[s - 2 * lo] is set once two entries seen so far add up to s
+    pair_sums = np.zeros(2 * size - 1, dtype=np.uint8) if k == 3 else None
+    found = set()
+    for value in entries:
+        if not lo <= value <= hi:
+            raise ValueError(f"entry {value} is outside of [{lo}, {hi}]")
+        i = value - lo
+        if k == 2:
+            j = target - value - lo
+            if 0 <= j < size and counts[j]:
+                pair = (target - value, value) if j <= i else (value, target - value)
+                if pair not in found:
+                    found.add(pair)
+                    yield pair
+        else:
+            c = target - value - 2 * lo
+            if 0 <= c < len(pair_sums) and pair_sums[c]:
+                # which pairs make up the sum is only worked out on a hit
+                firsts = np.arange(max(0, c - size + 1), c // 2 + 1)
+                seconds = c - firsts
+                both = (seen[firsts] > 0) & (seen[seconds] > (firsts == seconds))
+                for a in firsts[both].tolist():
+                    triple = tuple(sorted((a + lo, c - a + lo, value)))
+                    if triple not in found:
+                        found.add(triple)
+                        yield triple
+            if not counts[i]:
+                np.bitwise_or(pair_sums[i:i + size], seen, out=pair_sums[i:i + size])
+            elif counts[i] == 1:
+                # every other sum with this value is in there from its first time
+                pair_sums[2 * i] = 1
+        counts[i] = min(counts[i] + 1, 2)
+
+
+def stream_sums(
+    entries: Iterable[int], k: int, target: int = TARGET,
+    bounds: Optional[Tuple[int, int]] = None,
+) -> Iterator[Tuple[int, ...]]:
+    """Pairs or triples adding up to ``target``, yielded as soon as their last entry arrives.
+
+    Every entry is checked against an index of what came before it and only
+    read once, so the search can stop partway through a stream, e.g. with
+    ``next()``. Each combination of values comes up once, as sorted values.
+
+    Without ``bounds`` the index is a dict of the entries so far, and for
+    triples each entry scans it for a pair, O(n) memory and O(n^2) time.
+    Given ``bounds=(lo, hi)``, every entry has to fall inside them and the
+    index is a count per value in the range, plus for triples a bitmap of the
+    pair sums, so memory depends on the range and not on the stream length.
+
+    """
+    if k not in (2, 3):
+        raise ValueError(f"k must be 2 or 3 when streaming, got {k}")
+    if bounds is not None:
+        yield from _bounded_sums(entries, k, target, *bounds)
+        return
+    if k == 2:
+        yield from two_sums(entries, target)
+        return
+
+    seen = {}
+    found = set()
+    for value in entries:
+        rest = target - value
+        for a, count in seen.items():
+            b = rest - a
+            if a < b and b in seen or a == b and count > 1:
+                triple = tuple(sorted((a, b, value)))
+                if triple not in found:
+                    found.add(triple)
+                    yield triple
+        seen[value] = seen.get(value, 0) + 1
+
+
+def product_of_entries(entries: List[int], number: int, target: int = TARGET) -> Optional[int]:
+    found = find_sum(entries, number, target)
+    if found is None:
+        return None
+    return reduce(operator.mul, found, 1)
+
+
+TEST_ENTRIES = [1721, 979, 366, 299, 675, 1456]
+
+
+@pytest.mark.parametrize("number,expected", [
+    (2, 514579),
+    (3, 241861950),
+])
+def test_product_of_entries(number, expected):
+    assert product_of_entries(TEST_ENTRIES, number) == expected
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4, 5])
+def test_k_sums_match_combinations(k):
+    rng = random.Random(k)
+    entries = [rng.randint(-20, 40) for _ in range(25)]
+    for target in (-5, 0, 17, 60):
+        expected = {
+            tuple(sorted(c)) for c in itertools.combinations(entries, k) if sum(c) == target
+        }
+        found = list(k_sums(entries, k, target))
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+
+
+@pytest.mark.parametrize("k", [2, 3])
+@pytest.mark.parametrize("bounds", [None, (-20, 40)])
+def test_stream_sums_match_k_sums(k, bounds):
+    rng = random.Random(k)
+    entries = [rng.randint(-20, 40) for _ in range(40)]
+    for target in (-5, 0, 17, 60):
+        found = list(stream_sums(iter(entries), k, target, bounds))
+        assert len(found) == len(set(found))
+        assert set(found) == set(k_sums(entries, k, target))
+
+
+def test_stream_sums_stops_early():
+    def feed():
+        yield from TEST_ENTRIES
+        raise AssertionError("read past the answer")
+
+    assert next(stream_sums(feed(), 2)) == (299, 1721)
+    assert next(stream_sums(feed(), 3, bounds=(0, TARGET))) == (366, 675, 979)
+    lines = io.StringIO("\n".join(map(str, TEST_ENTRIES)) + "\n")
+    assert list(stream_sums(read_entries(lines), 2)) == [(299, 1721)]
+    with pytest.raises(ValueError):
+        next(stream_sums(iter([1, 5000]), 2, bounds=(0, TARGET)))
+
 
+def part1(data: str) -> Optional[int]:
+    return product_of_entries(parse_entries(data), 2)
 
-def product_of_entries(entries: List[int], number: int) -> Optional[int]:
 
-    # Thanks to Shawn Frueh for the idea of using itertools.combinations
-    # https://github.com/ShawnFrueh/advent_of_code/blob/266cada3c6d4949d7d88b4be75fbc85cc903b291/2020/day_01/answer.py#L30
-    for combination in itertools.combinations(entries, number):
-        if sum(combination) == 2020:
-            return reduce(operator.mul, combination, 1)
+def part2(data: str) -> Optional[int]:
+    return product_of_entries(parse_entries(data), 3)
 
 
 if __name__ == '__main__':
@@ -3,26 +3,35 @@
 https://adventofcode.com/2020/day/2
 
 """
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import NamedTuple, List
+from typing import NamedTuple, Optional, Union
 
+import numpy as np
 import pytest
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
 
-def main() -> None:
-    # read from file
-    input_str = read_input()
+from aoc.inputs import InputFile  # noqa: E402
+from aoc.ints import as_array, integer_spans  # noqa: E402
 
-    # parse input
-    lines = parse_input(input_str)
 
-    # filter input to valid passwords
-    valid_lines1 = [line for line in lines if line_is_valid1(line)]
-    valid_lines2 = [line for line in lines if line_is_valid2(line)]
+def main() -> None:
+    # a dump given on the command line is checked in chunks on every core
+    if len(sys.argv) > 1:
+        result = validate_file(sys.argv[1])
+    else:
+        result = validate_batch(read_input())
+    for error in result.errors:
+        print(error)
 
     # print number of valid passwords for rule1 and rule2
-    print(len(valid_lines1))
-    print(len(valid_lines2))
+    print(result.valid1)
+    print(result.valid2)
 
 
 def read_input() -> str:
@@ -59,7 +68,7 @@ def test_parse_line(line, expected):
     assert result == expected
 
 
-def parse_input(input_str: str) -> List[Line]:
+def parse_input(input_str: str) -> list[Line]:
     lines = []
     for line in input_str.strip().split("\n"):
         try:
@@ -108,5 +117,310 @@ def test_line_is_valid2(line, expected):
     assert result == expected
 
 
+class Columns(NamedTuple):
+    """The well formed lines of a batch, one array entry per line."""
+    row: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    letter: np.ndarray
+    # where each password starts and ends (exclusive) in the buffer
+    start: np.ndarray
+    end: np.ndarray
+    buf: np.ndarray
+    lines: int
+    # the text of the lines that aren't in the columns, by row
+    rest: list[tuple[int, str]]
+
+
+WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+def _line_bounds(buf: np.ndarray, strip: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """Where every line starts and ends (exclusive)."""
+    if not len(buf):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    lo, hi = 0, len(buf)
+    # like str.strip(), or for a chunk just the line break it ends with
+    if strip:
+        while hi > lo and buf[hi - 1] in WHITESPACE:
+            hi -= 1
+        while lo < hi and buf[lo] in WHITESPACE:
+            lo += 1
+    elif buf[hi - 1] == ord("\n"):
+        hi -= 1
+    if strip and lo == hi:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    newlines = np.flatnonzero(buf[lo:hi] == ord("\n")) + lo
+    starts = np.concatenate(([lo], newlines + 1))
+    ends = np.concatenate((newlines, [hi]))
+    return starts, ends
+
+
+def parse_columns(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Columns:
+    """Pull apart every line that is exactly ``<min>-<max> <letter>: <password>``.
+
+    Anything else, like extra whitespace, is left out of the columns, the
+    rows that are in them say which lines made it.
+
+    """
+    n = len(buf)
+    ends = ends - ((ends > starts) & (buf[np.maximum(ends - 1, 0)] == ord("\r")))
+    ok = ends > starts
+
+    # the only two spaces in the line, around the letter
+    spaces = np.flatnonzero(buf == ord(" "))
+    first = np.searchsorted(spaces, starts)
+    ok &= np.searchsorted(spaces, ends) - first == 2
+    last = max(len(spaces) - 1, 0)
+    space1 = spaces[np.minimum(first, last)] if len(spaces) else np.zeros_like(starts)
+    space2 = spaces[np.minimum(first + 1, last)] if len(spaces) else np.zeros_like(starts)
+    ok &= space2 == space1 + 3
+    ok &= buf[np.minimum(space1 + 2, n - 1)] == ord(":")
+    letter = buf[np.minimum(space1 + 1, n - 1)]
+    ok &= letter != ord(":")
+    ok &= ends > space2 + 1
+
+    # the line starts with two numbers joined by a dash, the second ending at the space
+    values, digit_starts, digit_ends = integer_spans(buf)
+    k = np.minimum(np.searchsorted(digit_starts, starts), max(len(values) - 2, 0))
+    if len(values) >= 2:
+        dash = digit_ends[k]
+        ok &= digit_starts[k] == starts
+        ok &= buf[np.minimum(dash, n - 1)] == ord("-")
+        ok &= (digit_starts[k + 1] == dash + 1) & (digit_ends[k + 1] == space1)
+    else:
+        ok[:] = False
+
+    rows = np.flatnonzero(ok)
+    k = k[rows]
+    rest = [
+        (row, buf[starts[row]:ends[row]].tobytes().decode())
+        for row in np.flatnonzero(~ok).tolist()
+    ]
+    return Columns(
+        row=rows,
+        min=values[k] if len(rows) else np.zeros(0, dtype=np.int64),
+        max=values[k + 1] if len(rows) else np.zeros(0, dtype=np.int64),
+        letter=letter[rows],
+        start=space2[rows] + 1,
+        end=ends[rows],
+        buf=buf,
+        lines=len(starts),
+        rest=rest,
+    )
+
+
+def parse_batch(data: Union[str, bytes, memoryview], strip: bool = True) -> Columns:
+    """Every line of the batch in columns, the checking is left to the parts.
+
+    Whitespace around the whole batch is ignored, unless it's a chunk of a
+    bigger input that has been stripped already.
+
+    """
+    buf = as_array(data)
+    starts, ends = _line_bounds(buf, strip)
+    return parse_columns(buf, starts, ends)
+
+
+def letter_counts(buf: np.ndarray, columns: Columns) -> np.ndarray:
+    """How many times each password holds its letter."""
+    if not len(columns.row):
+        return np.zeros(0, dtype=np.int64)
+    # paint every password's letter over its bytes, with 0 everywhere else,
+    # as steps that a wrapping uint8 cumsum adds back up
+    steps = np.zeros(len(buf) + 1, dtype=np.uint8)
+    steps[columns.start] = columns.letter
+    steps[columns.end] = -columns.letter
+    letters = np.cumsum(steps[:-1], dtype=np.uint8)
+    matches = buf == letters
+    return np.add.reduceat(matches, columns.start, dtype=np.int64)
+
+
+def letter_at(buf: np.ndarray, columns: Columns, position: np.ndarray) -> np.ndarray:
+    """Whether the letter is at each password's 1-based ``position``."""
+    inside = (position >= 1) & (position <= columns.end - columns.start)
+    index = np.where(inside, columns.start + position - 1, 0)
+    return inside & (buf[index] == columns.letter)
+
+
+class BatchResult(NamedTuple):
+    valid1: int
+    valid2: int
+    # per line, only when asked for
+    mask1: Optional[np.ndarray]
+    mask2: Optional[np.ndarray]
+    errors: list[str]
+
+
+def _parse_rest(columns: Columns) -> tuple[list[tuple[int, Line]], list[str]]:
+    """The lines outside the columns through ``parse_line``, and the errors."""
+    lines, errors = [], []
+    for row, text in columns.rest:
+        try:
+            lines.append((row, parse_line(text)))
+        except Exception as err:
+            errors.append(f"Failed to parse line: {text} with {err.__class__.__name__}: {err}")
+    return lines, errors
+
+
+def valid_mask1(columns: Columns) -> np.ndarray:
+    """Which lines hold their letter between min and max times."""
+    valid = np.zeros(columns.lines, dtype=bool)
+    counts = letter_counts(columns.buf, columns)
+    valid[columns.row] = (columns.min <= counts) & (counts <= columns.max)
+    for row, line in _parse_rest(columns)[0]:
+        valid[row] = line_is_valid1(line)
+    return valid
+
+
+def valid_mask2(columns: Columns) -> np.ndarray:
+    """Which lines hold their letter at exactly one of the min and max positions."""
+    valid = np.zeros(columns.lines, dtype=bool)
+    at_min = letter_at(columns.buf, columns, columns.min)
+    at_max = letter_at(columns.buf, columns, columns.max) & (columns.min != columns.max)
+    valid[columns.row] = at_min ^ at_max
+    for row, line in _parse_rest(columns)[0]:
+        valid[row] = line_is_valid2(line)
+    return valid
+
+
+def validate_batch(data: Union[str, bytes, memoryview], masks: bool = False,
+                   strip: bool = True) -> BatchResult:
+    """Check every line against both policies at once.
+
+    The lines are parsed into columns and checked with array operations.
+    The few lines that aren't in exactly the expected layout go through
+    ``parse_line`` instead, so they are accepted or reported the same way as
+    by ``parse_input``.
+
+    """
+    columns = parse_batch(data, strip)
+    valid1 = valid_mask1(columns)
+    valid2 = valid_mask2(columns)
+    errors = _parse_rest(columns)[1]
+    return BatchResult(
+        valid1=int(valid1.sum()),
+        valid2=int(valid2.sum()),
+        mask1=valid1 if masks else None,
+        mask2=valid2 if masks else None,
+        errors=errors,
+    )
+
+
+CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def chunk_bounds(f: InputFile, chunks: int, max_bytes: int = CHUNK_BYTES) -> list[tuple[int, int]]:
+    """Split the file into about ``chunks`` byte ranges, each ending at a line break."""
+    size = max(1, min(max_bytes, -(-len(f) // max(chunks, 1))))
+    bounds = []
+    start = f.start
+    while start < f.end:
+        end = min(start + size, f.end)
+        if end < f.end:
+            # move forward to the end of the line it falls in
+            newline = f.find(b"\n", end - 1)
+            end = f.end if newline == -1 else newline + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _validate_chunk(path: str, start: int, end: int) -> BatchResult:
+    """Check one chunk with ``validate_batch``.
+
+    Not line by line with ``line_is_valid1`` and ``line_is_valid2``: the
+    batch check gives the same answers (lines it can't take in columns go
+    through those validators anyway) and is much faster per chunk.
+
+    """
+    with InputFile(path, strip=False) as f:
+        # the whole file is stripped, and blank lines between chunks are errors
+        return validate_batch(f.buffer[start:end], strip=False)
+
+
+def validate_file(path: Union[str, Path], workers: Optional[int] = None,
+                  max_bytes: int = CHUNK_BYTES) -> BatchResult:
+    """``validate_batch`` over a file too big to take in one go.
+
+    The file is split into chunks at line breaks, at most ``max_bytes`` and
+    at least one per worker, and each worker process maps the file and
+    checks its own chunks. Only the counts and the parse errors come back,
+    in the order of the chunks, so there are no masks.
+
+    """
+    workers = workers or os.cpu_count()
+    with InputFile(path) as f:
+        bounds = chunk_bounds(f, workers, max_bytes)
+    path = str(path)
+    if workers == 1 or len(bounds) == 1:
+        results = [_validate_chunk(path, start, end) for start, end in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _validate_chunk,
+                [path] * len(bounds),
+                [start for start, _ in bounds],
+                [end for _, end in bounds],
+            ))
+    return BatchResult(
+        valid1=sum(result.valid1 for result in results),
+        valid2=sum(result.valid2 for result in results),
+        mask1=None,
+        mask2=None,
+        errors=[error for result in results for error in result.errors],
+    )
+
+
+def test_validate_batch():
+    data = "1-3 a: abcde\n1-3 b: cdefg\r\n2-9 c: ccccccccc\n 1-1 a: a\nbad\n4-4 x: abc\n"
+    result = validate_batch(data, masks=True)
+    assert result.mask1.tolist() == [True, False, True, True, False, False]
+    assert result.mask2.tolist() == [True, False, False, True, False, False]
+    assert (result.valid1, result.valid2) == (3, 2)
+    assert result.errors == [
+        "Failed to parse line: bad with ValueError: Invalid line: bad, "
+        "expected 3 parts separated by spaces"
+    ]
+    assert validate_batch("") == (0, 0, None, None, [])
+    assert validate_batch("\n1-3 a: abcde\n1-3 b: cdefg\n\n") == (1, 1, None, None, [])
+
+
+def test_validate_batch_matches_lines():
+    rng = np.random.default_rng(2)
+    lines = []
+    for _ in range(500):
+        password = "".join(rng.choice(list("abc"), size=rng.integers(1, 12)))
+        low, high = sorted(rng.integers(0, 14, size=2))
+        lines.append(f"{low}-{high} {rng.choice(list('abc'))}: {password}")
+    result = validate_batch("\n".join(lines), masks=True)
+    parsed = [parse_line(line) for line in lines]
+    assert result.mask1.tolist() == [line_is_valid1(line) for line in parsed]
+    assert result.mask2.tolist() == [line_is_valid2(line) for line in parsed]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_file(tmp_path, workers):
+    lines = ["1-3 a: abcde", "1-3 b: cdefg", "bad", "", "2-9 c: ccccccccc"] * 50
+    path = tmp_path / "input"
+    path.write_text("\n".join(lines) + "\n")
+    whole = validate_batch("\n".join(lines))
+    # small chunks, so lines of every length get split across them
+    for max_bytes in (1, 7, 100, CHUNK_BYTES):
+        result = validate_file(path, workers, max_bytes)
+        assert result == whole._replace(mask1=None, mask2=None)
+
+
+def part1(columns: Columns) -> int:
+    return int(valid_mask1(columns).sum())
+
+
+def part2(columns: Columns) -> int:
+    return int(valid_mask2(columns).sum())
+
+
+PARSER = parse_batch
+
+
 if __name__ == '__main__':
     main()
@@ -4,25 +4,59 @@ https://adventofcode.com/2020/day/3
 
 """
 import operator
+import sys
 from functools import reduce
 from pathlib import Path
+from typing import Sequence, Tuple
 
+import numpy as np
 import pytest
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc.grid import Grid  # noqa: E402
+
+
+SLOPES = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+
+
+def parse_trees(tree_map: str) -> np.ndarray:
+    """Boolean array of where the trees are, ``[y, x]``."""
+    return Grid.parse(tree_map).mask("#")
+
+
+def count_trees(trees: np.ndarray, slopes: Sequence[Tuple[int, int]]) -> np.ndarray:
+    """Trees hit going down each ``(right, down)`` slope from the top left.
+
+    On step ``i`` a slope is in column ``i * right % width``, which only
+    depends on ``i % width``. So one pass over the rows a ``down`` reaches
+    sums them up by step modulo the width, and every slope with that
+    ``down`` then adds up one cell per phase. The map is read once per
+    distinct ``down``, and each extra slope only costs O(width).
+
+    """
+    rights, downs = np.array(slopes, dtype=np.int64).reshape(-1, 2).T
+    if (downs < 1).any():
+        raise ValueError("every slope has to go down at least one row")
+    height, width = trees.shape
+    counts = np.zeros(len(rights), dtype=np.int64)
+    phases = np.arange(width)
+    for down in sorted(set(downs.tolist())):
+        rows = trees[::down]
+        full = len(rows) // width * width
+        # by_phase[k, x] is how many trees are in column x on steps k, k + width, ...
+        by_phase = rows[:full].reshape(-1, width, width).sum(axis=0, dtype=np.int64)
+        by_phase[:len(rows) - full] += rows[full:]
+        group = np.flatnonzero(downs == down)
+        xs = phases * rights[group, None] % width
+        counts[group] = by_phase[phases, xs].sum(axis=1)
+    return counts
+
 
 def trees_encountered(right: int, down: int, tree_map: str) -> int:
-    rows = tree_map.strip().split("\n")
-    width = len(rows[0])
-    x = 0
-    trees = 0
-    for y, row in enumerate(rows):
-        if y % down != 0:
-            continue
-        position = row[x % width]
-        if position == "#":
-            trees += 1
-        x += right
-    return trees
+    return int(count_trees(parse_trees(tree_map), [(right, down)])[0])
 
 
 TEST_TREE_MAP = """..##.......
@@ -50,22 +84,40 @@ def test_tree_map(right, down, expected):
     assert trees_encountered(right, down, TEST_TREE_MAP) == expected
 
 
+def test_count_trees():
+    trees = parse_trees(TEST_TREE_MAP)
+    assert count_trees(trees, SLOPES).tolist() == [2, 7, 3, 4, 2]
+    slopes = [(right, down) for right in range(-12, 13) for down in range(1, 13)]
+    rows = TEST_TREE_MAP.split()
+    expected = [
+        sum(row[i * right % len(row)] == "#" for i, row in enumerate(rows[::down]))
+        for right, down in slopes
+    ]
+    assert count_trees(trees, slopes).tolist() == expected
+    with pytest.raises(ValueError):
+        count_trees(trees, [(1, 0)])
+
+
+def part1(trees: np.ndarray) -> int:
+    return int(count_trees(trees, [(3, 1)])[0])
+
+
+def part2(trees: np.ndarray) -> int:
+    return reduce(operator.mul, count_trees(trees, SLOPES).tolist(), 1)
+
+
+PARSER = parse_trees
+
+
 def main():
     input_file = Path(__file__).parent / "input"
-    tree_map = input_file.read_text()
+    trees = parse_trees(input_file.read_text())
 
     # part 1
-    print(trees_encountered(3, 1, tree_map))
+    print(part1(trees))
 
     # part 2
-    product = reduce(operator.mul, [
-        trees_encountered(1, 1, tree_map),
-        trees_encountered(3, 1, tree_map),
-        trees_encountered(5, 1, tree_map),
-        trees_encountered(7, 1, tree_map),
-        trees_encountered(1, 2, tree_map),
-    ], 1)
-    print(product)
+    print(part2(trees))
 
 
 if __name__ == "__main__":
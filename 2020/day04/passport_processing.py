@@ -3,93 +3,155 @@
 https://adventofcode.com/2020/day/4
 
 """
-import string
+import re
+import sys
+from collections import Counter
 from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc.inputs import read_records  # noqa: E402
+
+
+class Field(NamedTuple):
+    """What a passport field has to look like.
+
+    ``pattern`` has to match the whole value. If it has a ``number`` group,
+    that number has to be inside the range in ``ranges`` for the ``unit``
+    group (``""`` without one). Values outside of ``choices`` are invalid.
+
+    """
+    pattern: Optional[str] = None
+    ranges: Mapping[str, Tuple[int, int]] = {}
+    choices: Optional[FrozenSet[str]] = None
+    required: bool = True
+
+
+SCHEMA = {
+    # byr (Birth Year) - four digits; at least 1920 and at most 2002.
+    "byr": Field(r"(?P<number>\d{4})", {"": (1920, 2002)}),
+    # iyr (Issue Year) - four digits; at least 2010 and at most 2020.
+    "iyr": Field(r"(?P<number>\d{4})", {"": (2010, 2020)}),
+    # eyr (Expiration Year) - four digits; at least 2020 and at most 2030.
+    "eyr": Field(r"(?P<number>\d{4})", {"": (2020, 2030)}),
+    # hgt (Height) - a number followed by either cm or in:
+    # If cm, the number must be at least 150 and at most 193.
+    # If in, the number must be at least 59 and at most 76.
+    "hgt": Field(r"(?P<number>\d+)(?P<unit>cm|in)", {"cm": (150, 193), "in": (59, 76)}),
+    # hcl (Hair Color) - a # followed by exactly six characters 0-9 or a-f.
+    "hcl": Field(r"#[0-9a-f]{6}"),
+    # ecl (Eye Color) - exactly one of: amb blu brn gry grn hzl oth.
+    "ecl": Field(choices=frozenset({"amb", "blu", "brn", "gry", "grn", "hzl", "oth"})),
+    # pid (Passport ID) - a nine-digit number, including leading zeroes.
+    "pid": Field(r"\d{9}"),
+    # cid (Country ID) - ignored, missing or not.
+    "cid": Field(required=False),
+}
+
+Check = Callable[[str], bool]
+
+
+def compile_field(field: Field) -> Check:
+    """A function telling whether a value is valid for ``field``, without raising."""
+    regex = re.compile(field.pattern) if field.pattern is not None else None
+    choices = field.choices
+    if regex is None:
+        if choices is None:
+            return lambda value: True
+        return choices.__contains__
+
+    ranges = dict(field.ranges)
+    has_unit = "unit" in regex.groupindex
+    if not ranges:
+        def check(value: str) -> bool:
+            return regex.fullmatch(value) is not None and (choices is None or value in choices)
+        return check
+
+    def check_range(value: str) -> bool:
+        match = regex.fullmatch(value)
+        if match is None or choices is not None and value not in choices:
+            return False
+        low, high = ranges.get(match["unit"] if has_unit else "", (1, 0))
+        return low <= int(match["number"]) <= high
+    return check_range
+
+
+class Stats(NamedTuple):
+    records: int
+    # with every required field, whatever the values
+    complete: int
+    valid: int
+    # how many records miss a required field, or have an invalid value for it
+    missing: Counter
+    invalid: Counter
+
+
+class Validator:
+    # at most this many checked pairs are remembered
+    known_limit = 1 << 16
+
+    def __init__(self, schema: Mapping[str, Field] = SCHEMA):
+        self.checks: Dict[str, Check] = {
+            name: compile_field(field) for name, field in schema.items()}
+        self.required = frozenset(name for name, field in schema.items() if field.required)
+        # "name:value" pairs already checked, most values come up again and again
+        self._known: Dict[str, Tuple[str, bool]] = {}
+
+    def validate(self, records: Iterable[str]) -> Stats:
+        """Check every record, a passport's ``name:value`` pairs separated by whitespace.
+
+        Fields that aren't in the schema are allowed. Every field of every
+        record is checked, so the failures add up per field.
+
+        """
+        checks = self.checks
+        required = self.required
+        known = self._known
+        missing = Counter()
+        invalid = Counter()
+        count = complete = valid = 0
+        for record in records:
+            count += 1
+            ok = True
+            present = set()
+            for pair in record.split():
+                result = known.get(pair)
+                if result is None:
+                    name, _, value = pair.partition(":")
+                    check = checks.get(name)
+                    result = name, check is None or check(value)
+                    if len(known) < self.known_limit:
+                        known[pair] = result
+                name, good = result
+                present.add(name)
+                if not good:
+                    invalid[name] += 1
+                    ok = False
+            if required <= present:
+                complete += 1
+                valid += ok
+            else:
+                missing.update(required - present)
+        return Stats(count, complete, valid, missing, invalid)
 
 
-def valid_passports(data: str) -> int:
-    passports = data.strip().split("\n\n")
-    passports = [p.strip() for p in passports]
+VALIDATOR = Validator()
 
-    valid = 0
-    for passport in passports:
-        pairs = passport.split()
-        fields = [p.split(":")[0] for p in pairs]
-        required = {"ecl", "pid", "eyr", "hcl", "byr", "iyr", "hgt"}
-        if required.issubset(set(fields)):
-            valid += 1
 
-    return valid
+def valid_passports(data: str) -> int:
+    return VALIDATOR.validate(data.strip().split("\n\n")).complete
 
 
 def validate_field(field: str, value: str) -> bool:
-    try:
-        if field == "ecl":
-            # ecl (Eye Color) - exactly one of: amb blu brn gry grn hzl oth.
-            assert value in {"amb", "blu", "brn", "gry", "grn", "hzl", "oth"}
-        elif field == "pid":
-            # pid (Passport ID) - a nine-digit number, including leading zeroes.
-            assert len(value) == 9
-            for digit in value:
-                assert digit in string.digits
-        elif field == "eyr":
-            # eyr (Expiration Year) - four digits; at least 2020 and at most 2030.
-            assert 2020 <= int(value) <= 2030
-        elif field == "hcl":
-            # hcl (Hair Color) - a # followed by exactly six characters 0-9 or a-f.
-            assert value.startswith("#")
-            assert len(value) == 7  # hcl:#a97842
-            for char in value[1:]:
-                assert char in string.digits + string.ascii_lowercase[:6]
-        elif field == "byr":
-            # byr (Birth Year) - four digits; at least 1920 and at most 2002.
-            assert 1920 <= int(value) <= 2002
-        elif field == "iyr":
-            # iyr (Issue Year) - four digits; at least 2010 and at most 2020.
-            assert 2010 <= int(value) <= 2020
-        elif field == "hgt":
-            # hgt (Height) - a number followed by either cm or in:
-            # If cm, the number must be at least 150 and at most 193.
-            # If in, the number must be at least 59 and at most 76.
-            number = int(value.rstrip("incm"))
-            if value.endswith("cm"):
-                assert 150 <= number <= 193
-            elif value.endswith("in"):
-                assert 59 <= number <= 76
-            else:
-                raise AssertionError("Must end in 'in' or 'cm'")
-    except (ValueError, AssertionError) as err:
-        # print(f"{field}:{value} failed with {err}")
-        return False
-    else:
-        # print(f"{field}:{value} is valid")
-        return True
+    check = VALIDATOR.checks.get(field)
+    return check is None or check(value)
 
 
 def valid_passports2(data: str) -> int:
-    passports = data.strip().split("\n\n")
-    passports = [p.strip() for p in passports]
-
-    valid_count = 0
-    for passport in passports:
-        pairs = passport.split()
-        d = {}
-        for p in pairs:
-            k, v = p.split(":")
-            d[k] = v
-        required = {"ecl", "pid", "eyr", "hcl", "byr", "iyr", "hgt"}
-
-        valid = True
-        if not required.issubset(set(d.keys())):
-            valid = False
-        for k, v in d.items():
-            if not validate_field(k, v):
-                valid = False
-                break
-        if valid:
-            valid_count += 1
-
-    return valid_count
+    return VALIDATOR.validate(data.strip().split("\n\n")).valid
 
 
 PASSPORT_DATA = """ecl:gry pid:860033327 eyr:2020 hcl:#fffffd
@@ -147,15 +209,46 @@ def test_valid_passports_part2_invalid():
     assert valid_passports2(INVALID_DATA) == 0
 
 
+def test_validate_field():
+    assert validate_field("byr", "2002") and not validate_field("byr", "2003")
+    assert validate_field("hgt", "60in") and not validate_field("hgt", "190in")
+    assert validate_field("hgt", "190cm") and not validate_field("hgt", "190")
+    assert validate_field("hcl", "#123abc") and not validate_field("hcl", "#123abz")
+    assert not validate_field("hcl", "123abc")
+    assert validate_field("ecl", "brn") and not validate_field("ecl", "wat")
+    assert validate_field("pid", "000000001") and not validate_field("pid", "0123456789")
+    assert not validate_field("byr", "+1990") and not validate_field("byr", "01990")
+    assert validate_field("cid", "anything") and validate_field("xyz", "")
+
+
+def test_stats():
+    stats = VALIDATOR.validate(INVALID_DATA.split("\n\n") + [PASSPORT_DATA.split("\n\n")[1]])
+    assert (stats.records, stats.complete, stats.valid) == (5, 4, 0)
+    assert stats.missing == {"hgt": 1}
+    assert stats.invalid == {
+        "eyr": 3, "hgt": 2, "pid": 2, "hcl": 2, "byr": 1, "ecl": 1, "iyr": 1,
+    }
+
+
+def part1(data: str) -> int:
+    return valid_passports(data)
+
+
+def part2(data: str) -> int:
+    return valid_passports2(data)
+
+
 def main():
     input_file = Path(__file__).parent / "input"
-    passport_data = input_file.read_text()
+    # one passport at a time, however big the batch file is
+    with open(input_file) as f:
+        stats = VALIDATOR.validate(read_records(f))
 
     # part 1   time elapsed 15:20
-    print(valid_passports(passport_data))
+    print(stats.complete)
 
     # part 2   time elapsed 43:26
-    print(valid_passports2(passport_data))
+    print(stats.valid)
 
     # with cleanup - time elapsed 51:15
 
@@ -7,32 +7,77 @@ Cleaned up solution
 """
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, List, Optional
 
 import pytest
 
+# F and L take the lower half, B and R the upper, so a seat is a binary number
+SEAT_BITS = str.maketrans("FBLR", "0101")
+
 
 @dataclass
 class DecodedSeat:
     row: int
     col: int
+    col_bits: int = 3
 
     @property
     def id(self) -> int:
-        return calculate_id(self.row, self.col)
+        return calculate_id(self.row, self.col, self.col_bits)
+
+
+def calculate_id(row: int, col: int, col_bits: int = 3) -> int:
+    return row << col_bits | col
+
+
+class Plane:
+    """Seats with ``row_bits`` F/B and then ``col_bits`` L/R characters.
+
+    The ID of a seat is the row and column bits read together as one binary
+    number, so it comes straight out of the boarding pass without splitting
+    it into row and column first.
+
+    """
+    def __init__(self, row_bits: int = 7, col_bits: int = 3):
+        self.row_bits = row_bits
+        self.col_bits = col_bits
+        self.width = row_bits + col_bits
+        self.seats = 1 << self.width
+
+    def decode(self, seat: str) -> DecodedSeat:
+        seat_id = self.seat_id(seat)
+        return DecodedSeat(
+            row=seat_id >> self.col_bits,
+            col=seat_id & ((1 << self.col_bits) - 1),
+            col_bits=self.col_bits,
+        )
+
+    def seat_id(self, seat: str) -> int:
+        if len(seat) != self.width:
+            raise ValueError(f"{seat!r} is not {self.width} characters long")
+        return int(seat.translate(SEAT_BITS), 2)
 
+    def seat_ids(self, data: str) -> List[int]:
+        """The ID of every boarding pass, one per line."""
+        # translating the whole input at once is cheaper than line by line
+        lines = data.translate(SEAT_BITS).split()
+        if any(len(line) != self.width for line in lines):
+            raise ValueError(f"boarding passes have to be {self.width} characters long")
+        return [int(line, 2) for line in lines]
 
-def calculate_id(row: int, col: int) -> int:
-    return row * 8 + col
+    def occupancy(self, ids: Iterable[int]) -> bytearray:
+        """One byte per seat of the plane, 1 for the taken ones."""
+        occupied = bytearray(self.seats)
+        for seat_id in ids:
+            occupied[seat_id] = 1
+        return occupied
+
+
+PLANE = Plane()
 
 
 def decode_seat(seat: str) -> DecodedSeat:
-    seat = seat.replace("F", "0").replace("B", "1").replace("L", "0").replace("R", "1")
-    row_part = seat[:7]
-    col_part = seat[7:]
-    row = int(f"0b{row_part}", 2)
-    col = int(f"0b{col_part}", 2)
-    return DecodedSeat(row=row, col=col)
+    return PLANE.decode(seat)
 
 
 @pytest.mark.parametrize("encoded_seat,expected", [
@@ -41,29 +86,40 @@ def decode_seat(seat: str) -> DecodedSeat:
     ("BBFFBBFRLL", (102, 4, 820)),
 ])
 def test_decode_seat(encoded_seat, expected):
-    assert decode_seat(encoded_seat) == expected
+    seat = decode_seat(encoded_seat)
+    assert (seat.row, seat.col, seat.id) == expected
 
 
-def part1(data: str) -> int:
-    encoded_seats = data.strip().split("\n")
-    return max([decode_seat(x).id for x in encoded_seats])
+def highest_seat(occupied: bytearray) -> Optional[int]:
+    seat_id = occupied.rfind(1)
+    return None if seat_id == -1 else seat_id
+
 
+def missing_seat(occupied: bytearray) -> Optional[int]:
+    """The first free seat with taken seats on both sides."""
+    i = occupied.find(b"\x01\x00\x01")
+    return None if i == -1 else i + 1
 
-def all_ids() -> Iterable[int]:
-    max_id = calculate_id(127, 7)
-    return range(max_id + 1)
+
+def test_occupancy():
+    plane = Plane(row_bits=2, col_bits=2)
+    assert plane.decode("BFRL") == DecodedSeat(row=2, col=2, col_bits=2)
+    ids = plane.seat_ids("FFLR\nFFRL\nFBLL\nFBLR\n")
+    assert ids == [1, 2, 4, 5]
+    occupied = plane.occupancy(ids)
+    assert highest_seat(occupied) == 5
+    assert missing_seat(occupied) == 3
+    assert missing_seat(plane.occupancy([1, 2])) is None
+    with pytest.raises(ValueError):
+        plane.seat_ids("FFLRR")
+
+
+def part1(data: str) -> int:
+    return highest_seat(PLANE.occupancy(PLANE.seat_ids(data)))
 
 
 def part2(data: str):
-    encoded_seats = data.strip().split("\n")
-    ids = [decode_seat(x).id for x in encoded_seats]
-    for seat_id in all_ids():
-        if (
-            seat_id + 1 in ids and
-            seat_id - 1 in ids and
-            seat_id not in ids
-        ):
-            return seat_id
+    return missing_seat(PLANE.occupancy(PLANE.seat_ids(data)))
 
 
 def main():
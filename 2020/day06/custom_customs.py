@@ -5,36 +5,95 @@ https://adventofcode.com/2020/day/6
 Initial solution to get the answer as quick as possible
 
 """
+import random
+import string
+import sys
 from pathlib import Path
+from typing import Tuple, Union
 
+import numpy as np
 
-def anyone_yes(group):
-    chars = set()
-    for char in group:
-        if char == "\n":
-            continue
-        chars.add(char)
-    return len(chars)
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
 
+from aoc.inputs import read_records  # noqa: E402
+from aoc.ints import as_array  # noqa: E402
+
+
+# bit i is the answer to question chr(ord("a") + i)
+BITS = {chr(ord("a") + i): 1 << i for i in range(26)}
+ALL_QUESTIONS = (1 << 26) - 1
+# the same for every byte, 0 for everything but the letters
+BYTE_BITS = np.zeros(256, dtype=np.uint32)
+BYTE_BITS[ord("a"):ord("z") + 1] = 1 << np.arange(26, dtype=np.uint32)
+
+
+def person_mask(answers: str) -> int:
+    mask = 0
+    for char in answers:
+        mask |= BITS[char]
+    return mask
 
-def part1(data: str):
-    groups = data.strip().split("\n\n")
-    counts = []
-    for group in groups:
-        counts.append(anyone_yes(group))
-    return sum(counts)
+
+def group_counts(group: str) -> Tuple[int, int]:
+    """How many questions anyone and how many everyone in the group answered yes to."""
+    anyone = 0
+    everyone = ALL_QUESTIONS
+    for person in group.split():
+        mask = person_mask(person)
+        anyone |= mask
+        everyone &= mask
+    return bin(anyone).count("1"), bin(everyone).count("1")
+
+
+def anyone_yes(group):
+    return group_counts(group)[0]
 
 
 def everyone_yes(group):
-    combined = group.replace("\n", "")
-    answers = set()
-    for char in combined:
-        answers.add(char)
-    count = 0
-    for a in answers:
-        if all([a in line for line in group.split()]):
-            count += 1
-    return count
+    return group_counts(group)[1]
+
+
+def answer_totals(data: Union[str, bytes, memoryview]) -> Tuple[int, int]:
+    """The sums of ``group_counts`` over all groups, in one vectorized pass.
+
+    Every letter becomes its bit, the bits of each line are ORed together
+    into a person, and the people of each group are reduced with OR and AND.
+
+    """
+    buf = as_array(data)
+    bits = BYTE_BITS[buf]
+
+    # every line runs up to and including its newline, which adds nothing
+    starts = np.concatenate(([0], np.flatnonzero(buf == ord("\n")) + 1))
+    starts = starts[starts < len(buf)]
+    if not len(starts):
+        return 0, 0
+    lines = np.bitwise_or.reduceat(bits, starts)
+
+    # the lines without answers are the blank ones between groups
+    blank = lines == 0
+    group = np.cumsum(blank)[~blank]
+    people = lines[~blank]
+    if not len(people):
+        return 0, 0
+    firsts = np.flatnonzero(np.concatenate(([True], group[1:] != group[:-1])))
+    anyone = np.bitwise_or.reduceat(people, firsts)
+    everyone = np.bitwise_and.reduceat(people, firsts)
+    return popcount(anyone), popcount(everyone)
+
+
+def popcount(masks: np.ndarray) -> int:
+    """Total of the bits set in all of ``masks``."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(masks).sum(dtype=np.int64))
+    # NumPy before 2.0
+    return int(np.unpackbits(masks.view(np.uint8)).sum(dtype=np.int64))
+
+
+def part1(data: str):
+    return answer_totals(data)[0]
 
 
 def test_part2():
@@ -57,15 +116,34 @@ b"""
 
 
 def part2(data: str):
-    groups = data.strip().split("\n\n")
-    return sum([everyone_yes(group) for group in groups])
+    return answer_totals(data)[1]
+
+
+def test_answer_totals():
+    rng = random.Random(6)
+    groups = [
+        "\n".join(
+            "".join(rng.sample(string.ascii_lowercase, rng.randint(1, 26)))
+            for _ in range(rng.randint(1, 5)))
+        for _ in range(200)
+    ]
+    data = "\n\n".join(groups) + "\n"
+    counts = [group_counts(group) for group in groups]
+    assert answer_totals(data) == tuple(map(sum, zip(*counts)))
+    assert answer_totals("\r\n") == answer_totals("") == (0, 0)
 
 
 def main():
     input_file = Path(__file__).parent / "input"
-    data = input_file.read_text()
-    print(part1(data))
-    print(part2(data))
+    # one group at a time, both parts in the same pass over the file
+    anyone = everyone = 0
+    with open(input_file) as f:
+        for group in read_records(f):
+            group_anyone, group_everyone = group_counts(group)
+            anyone += group_anyone
+            everyone += group_everyone
+    print(anyone)
+    print(everyone)
 
 
 if __name__ == "__main__":
@@ -3,10 +3,15 @@
 https://adventofcode.com/2020/day/7
 
 """
+import os
+import pickle
 import re
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import pytest
 
 
 # -- parse data into lookup table
@@ -21,58 +26,222 @@ class Bag:
 BagLookup = Dict[str, List[Bag]]
 
 
-def create_bag_lookup(data: str) -> BagLookup:
+# regex patterns
+contains_nothing_pattern = re.compile(r"(\w+ \w+) bags contain no other bags?\.")
+contains_something_pattern = re.compile(r"(\w+ \w+) bags contain (.*)\.")
+part_pattern = re.compile(r"(\d+) (\w+ \w+) bags?")
+
+
+def parse_rule(line: str) -> Optional[Tuple[str, List[Bag]]]:
+    if m := contains_nothing_pattern.match(line):
+        return m.groups()[0], []
+    elif m := contains_something_pattern.match(line):
+        name = m.groups()[0]
+        contains = []
+        rest = m.groups()[1]
+        for part in rest.split(", "):
+            if m := part_pattern.match(part):
+                contains.append(Bag(count=int(m.groups()[0]), name=m.groups()[1]))
+            else:
+                print(f"ERROR: {part}")
+        return name, contains
+    print(f"ERROR: {line}")
+    return None
+
 
-    # regex patterns
-    contains_nothing_pattern = re.compile(r"(\w+ \w+) bags contain no other bags?\.")
-    contains_something_pattern = re.compile(r"(\w+ \w+) bags contain (.*)\.")
-    part_pattern = re.compile(r"(\d+) (\w+ \w+) bags?")
+def format_rule(name: str, bags: List[Bag]) -> str:
+    if not bags:
+        return f"{name} bags contain no other bags."
+    parts = [f"{bag.count} {bag.name} {'bag' if bag.count == 1 else 'bags'}" for bag in bags]
+    return f"{name} bags contain {', '.join(parts)}."
 
+
+def create_bag_lookup(data: str) -> BagLookup:
     lookup = {}
     for line in data.split("\n"):
-        if m := contains_nothing_pattern.match(line):
-            lookup[m.groups()[0]] = []
-        elif m := contains_something_pattern.match(line):
-            name = m.groups()[0]
-            contains = []
-            rest = m.groups()[1]
-            for part in rest.split(", "):
-                if m := part_pattern.match(part):
-                    contains.append(Bag(count=int(m.groups()[0]), name=m.groups()[1]))
-                else:
-                    print(f"ERROR: {part}")
+        rule = parse_rule(line)
+        if rule is not None:
+            name, contains = rule
             lookup[name] = contains
-        else:
-            print(f"ERROR: {line}")
     return lookup
 
 
-# -- part 1
+# -- graph
+
+
+class BagGraph:
+    """The rules both ways: what each bag holds, and which bags hold it.
+
+    Totals are worked out once per bag and kept, so asking about many bags
+    costs no more than asking about the one that holds them all.
+
+    """
+    def __init__(self, bag_lookup: BagLookup, rules: Optional[Dict[str, str]] = None):
+        self.contents = bag_lookup
+        self.parents: Dict[str, Set[str]] = {}
+        for name, bags in bag_lookup.items():
+            for bag in bags:
+                self.parents.setdefault(bag.name, set()).add(name)
+        # the line each rule came from, to tell which ones changed
+        self.rules = rules if rules is not None else {
+            name: format_rule(name, bags) for name, bags in bag_lookup.items()}
+        self._totals: Dict[str, int] = {}
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+
+    def ancestors(self, name: str) -> FrozenSet[str]:
+        """Every bag that ends up holding ``name``, directly or not."""
+        if name in self._ancestors:
+            return self._ancestors[name]
+        found = set()
+        queue = deque([name])
+        while queue:
+            for parent in self.parents.get(queue.popleft(), ()):
+                if parent not in found:
+                    found.add(parent)
+                    queue.append(parent)
+        self._ancestors[name] = frozenset(found)
+        return self._ancestors[name]
+
+    def descendants(self, name: str) -> Set[str]:
+        """Every bag that ends up inside ``name``."""
+        found = set()
+        queue = deque([name])
+        while queue:
+            for bag in self.contents.get(queue.popleft(), ()):
+                if bag.name not in found:
+                    found.add(bag.name)
+                    queue.append(bag.name)
+        return found
+
+    def contained(self, name: str) -> int:
+        """How many bags are inside ``name``, all the way down."""
+        totals = self._totals
+        # depth first, a bag's total is only worked out once all of its
+        # contents are done, without recursing so deep rule sets are fine
+        unfinished = set()
+        stack = [(name, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current in totals:
+                continue
+            bags = self.contents.get(current, [])
+            if expanded:
+                totals[current] = sum(bag.count * (1 + totals[bag.name]) for bag in bags)
+                unfinished.discard(current)
+                continue
+            if current in unfinished:
+                raise ValueError(f"{current} bags end up inside themselves")
+            unfinished.add(current)
+            stack.append((current, True))
+            stack.extend((bag.name, False) for bag in bags if bag.name not in totals)
+        return totals[name]
+
+    # -- changing the rules
+
+    def set_rule(self, name: str, bags: List[Bag], line: Optional[str] = None) -> None:
+        """Add the rule for ``name``, or replace it.
+
+        Only what depends on the rule is forgotten: the totals of ``name``
+        and of the bags that hold it, and the ancestors of the bags inside
+        it, before or after the change.
+
+        """
+        stale = self.descendants(name)
+        for bag in self.contents.get(name, []):
+            self.parents[bag.name].discard(name)
+        self.contents[name] = list(bags)
+        for bag in bags:
+            self.parents.setdefault(bag.name, set()).add(name)
+        self.rules[name] = line if line is not None else format_rule(name, bags)
+
+        for bag in stale | self.descendants(name):
+            self._ancestors.pop(bag, None)
+        for bag in self.ancestors(name) | {name}:
+            self._totals.pop(bag, None)
+
+    def remove_rule(self, name: str) -> None:
+        """Forget the rule for ``name``, which then holds nothing."""
+        self.set_rule(name, [])
+        del self.contents[name]
+        del self.rules[name]
+
+    def sync(self, data: str) -> int:
+        """Bring the graph in line with the rules in ``data``, returns how many rules changed.
+
+        Lines are compared as text, only the new and changed ones are
+        parsed.
+
+        """
+        lines = {}
+        for line in data.split("\n"):
+            lines[line.partition(" bags contain ")[0]] = line
+        changed = 0
+        for name in [name for name in self.rules if name not in lines]:
+            self.remove_rule(name)
+            changed += 1
+        for key, line in lines.items():
+            if self.rules.get(key) == line:
+                continue
+            rule = parse_rule(line)
+            if rule is not None:
+                self.set_rule(*rule, line=line)
+                changed += 1
+        return changed
+
+    # -- keeping it between runs
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename, so a reader never sees half a graph
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((GRAPH_FORMAT, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BagGraph"]:
+        """The graph saved at ``path``, or None if there isn't a usable one."""
+        try:
+            with open(path, "rb") as f:
+                version, graph = pickle.load(f)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError, AttributeError):
+            return None
+        if version != GRAPH_FORMAT or not isinstance(graph, cls):
+            return None
+        return graph
+
+
+# bump when BagGraph changes, so that older saved graphs are rebuilt
+GRAPH_FORMAT = 1
+GRAPH_PATH = Path(__file__).resolve().parents[2] / ".aoc-cache" / "2020-day07-graph.pickle"
+
+
+def create_bag_graph(data: str) -> BagGraph:
+    lookup = {}
+    rules = {}
+    for line in data.split("\n"):
+        rule = parse_rule(line)
+        if rule is not None:
+            name, contains = rule
+            lookup[name] = contains
+            rules[name] = line
+    return BagGraph(lookup, rules)
 
 
-def part1(bag_lookup: BagLookup) -> int:
+def load_bag_graph(data: str, path: Path = GRAPH_PATH) -> BagGraph:
+    """The graph saved at ``path`` updated to ``data``, or a new one if there isn't one."""
+    graph = BagGraph.load(path)
+    if graph is None:
+        return create_bag_graph(data)
+    graph.sync(data)
+    return graph
 
-    def find_parents(name: str) -> List[str]:
-        result = []
-        for candidate_name, bags in bag_lookup.items():
-            bag_names = [bag.name for bag in bags]
-            if name in bag_names:
-                result.append(candidate_name)
-        return result
 
-    def find_all_parents(all_parents: List[str], names: List[str]) -> List[str]:
-        if not names:
-            return all_parents
-        new_names = []
-        while names:
-            name = names.pop()
-            parents = find_parents(name)
-            new_names.extend(parents)
-            all_parents.extend(parents)
-        return find_all_parents(list(set(all_parents)), list(set(new_names)))
+# -- part 1
+
 
-    all_parents = find_all_parents([], ["shiny gold"])
-    return len(all_parents)
+def part1(bag_graph: BagGraph) -> int:
+    return len(bag_graph.ancestors("shiny gold"))
 
 
 TEST_DATA = """light red bags contain 1 bright white bag, 2 muted yellow bags.
@@ -87,26 +256,14 @@ dotted black bags contain no other bags."""
 
 
 def test_part1():
-    assert part1(create_bag_lookup(TEST_DATA)) == 4
+    assert part1(create_bag_graph(TEST_DATA)) == 4
 
 
 # -- part2
 
 
-def part2(bag_lookup: BagLookup) -> int:
-
-    def calculate_inside_bags(bags, count):
-        if not bags:
-            return count
-        new_bags = []
-        for bag in bags:
-            for _ in range(bag.count):
-                new_bags.extend(bag_lookup[bag.name])
-                count += 1
-        return calculate_inside_bags(new_bags, count)
-
-    total = calculate_inside_bags([Bag(count=1, name="shiny gold")], 0)
-    return total - 1  # subtract the original bag
+def part2(bag_graph: BagGraph) -> int:
+    return bag_graph.contained("shiny gold")
 
 
 TEST_DATA2 = """shiny gold bags contain 2 dark red bags.
@@ -119,24 +276,84 @@ dark violet bags contain no other bags."""
 
 
 def test_part2():
-    assert part2(create_bag_lookup(TEST_DATA2)) == 126
+    assert part2(create_bag_graph(TEST_DATA2)) == 126
+
+
+def test_bag_graph():
+    graph = create_bag_graph(TEST_DATA)
+    assert graph.ancestors("faded blue") == {
+        "light red", "dark orange", "bright white", "muted yellow", "shiny gold",
+        "dark olive", "vibrant plum",
+    }
+    assert graph.ancestors("light red") == set()
+    assert graph.contained("dark olive") == 7
+    assert graph.contained("faded blue") == 0
+    assert graph.contained("shiny gold") == 32
+
+    # deep and wide enough that expanding bag by bag would never finish
+    rules = [f"level{i} a bags contain 9 level{i + 1} a bags." for i in range(2000)]
+    graph = create_bag_graph("\n".join(rules + ["level2000 a bags contain no other bags."]))
+    assert graph.contained("level0 a") == sum(9 ** i for i in range(1, 2001))
+    assert len(graph.ancestors("level2000 a")) == 2000
+
+    graph = create_bag_graph("a a bags contain 1 b b bag.\nb b bags contain 2 a a bags.")
+    with pytest.raises(ValueError):
+        graph.contained("a a")
+
+
+def check_queries(graph: BagGraph, data: str):
+    fresh = create_bag_graph(data)
+    for name in fresh.contents:
+        assert graph.contained(name) == fresh.contained(name)
+        assert graph.ancestors(name) == fresh.ancestors(name)
+
+
+def test_rule_updates(tmp_path):
+    graph = create_bag_graph(TEST_DATA)
+    check_queries(graph, TEST_DATA)
+
+    lines = TEST_DATA.split("\n")
+    lines[4] = "shiny gold bags contain 2 dark olive bags."
+    lines[7] = "faded blue bags contain 3 dotted black bags."
+    del lines[2]
+    lines.append("bright white bags contain 2 shiny gold bags, 1 faded blue bag.")
+    lines.append("plain tan bags contain 1 light red bag.")
+    data = "\n".join(lines)
+    assert graph.sync(data) == 4
+    check_queries(graph, data)
+
+    graph.remove_rule("plain tan")
+    graph.set_rule("dotted black", [Bag(2, "posh red")])
+    assert graph.rules["dotted black"] == "dotted black bags contain 2 posh red bags."
+    assert "plain tan" not in graph.ancestors("light red")
+    data = "\n".join(graph.rules.values())
+    check_queries(graph, data)
+
+    path = tmp_path / "graph.pickle"
+    graph.save(path)
+    loaded = load_bag_graph(data, path)
+    assert loaded.rules == graph.rules and loaded._totals == graph._totals
+    assert BagGraph.load(tmp_path / "missing.pickle") is None
 
 
 def main():
     input_file = Path(__file__).parent / "input"
     data = input_file.read_text()
-    bag_lookup = create_bag_lookup(data)
+    # only the rules that changed since the last run are parsed again
+    bag_graph = load_bag_graph(data)
 
-    answer1 = part1(bag_lookup)
+    answer1 = part1(bag_graph)
     print(answer1)
     if answer1 != 287:
         print(f"Expected 287, got {answer1}")
 
-    answer2 = part2(bag_lookup)
+    answer2 = part2(bag_graph)
     print(answer2)
     if answer2 != 48160:
         print(f"Expected 48160, got {answer2}")
 
+    bag_graph.save(GRAPH_PATH)
+
 
 if __name__ == "__main__":
     main()
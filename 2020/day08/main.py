@@ -3,86 +3,221 @@
 https://adventofcode.com/2020/day/8
 
 """
-import io
-import re
+import json
+import random
+import sys
+from array import array
 from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple, Union
 
+import numpy as np
+import pytest
 
-class InfiniteLoopError(Exception):
-    pass
-
-
-class ProgramFinishedError(Exception):
-    pass
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
 
+from aoc.ints import as_array, integers  # noqa: E402
 
-class Program(io.StringIO):
-    # nop_pattern = re.compile(r"nop \+0\n")
-    acc_pattern = re.compile(r"acc (\+|-)(\d+)\n?")
-    jmp_pattern = re.compile(r"jmp (\+|-)(\d+)\n?")
 
-    def __init__(self, *args, **kwargs):
+class InfiniteLoopError(Exception):
+    """An instruction was about to run a second time, the argument is the accumulator."""
+
+    @property
+    def acc(self) -> int:
+        return self.args[0]
+
+
+class JumpOutOfBoundsError(ValueError):
+    """A jump went to before the first instruction."""
+
+
+NOP, ACC, JMP = 0, 1, 2
+OPCODES = {"nop": NOP, "acc": ACC, "jmp": JMP}
+MNEMONICS = {code: name for name, code in OPCODES.items()}
+
+# lookup tables for parsing, by the first letter and then by opcode
+UNKNOWN = 255
+FIRST_LETTER_OPS = np.full(256, UNKNOWN, dtype=np.uint8)
+OP_SECOND = np.zeros(256, dtype=np.uint8)
+OP_THIRD = np.zeros(256, dtype=np.uint8)
+for _name, _code in OPCODES.items():
+    FIRST_LETTER_OPS[ord(_name[0])] = _code
+    OP_SECOND[_code], OP_THIRD[_code] = ord(_name[1]), ord(_name[2])
+
+
+class Trace:
+    """What traced runs of a program did, kept in flat arrays.
+
+    ``counts`` adds up over every run traced with it, so it shows the
+    instructions a search that runs the program over and over spends its
+    time on. The rest describes the last run: the pcs in the order they
+    ran, the accumulator after each of them, and where in that order the
+    loop starts if the run ended in one.
+
+    """
+    def __init__(self, size: int):
+        self.runs = 0
+        self.counts = array("q", bytes(8 * size))
+        self.path = array("q")
+        self.acc = array("q")
+        self.loop_start: Optional[int] = None
+
+    @property
+    def loop_body(self) -> array:
+        """The pcs that repeat, in order, empty if the last run ended."""
+        if self.loop_start is None:
+            return array("q")
+        return self.path[self.loop_start:]
+
+    def hottest(self, n: int = 5) -> List[Tuple[int, int]]:
+        """The ``n`` most executed instructions as ``(pc, count)``."""
+        counts = np.frombuffer(self.counts, dtype=np.int64)
+        top = np.argsort(-counts, kind="stable")[:n]
+        return [(pc, int(counts[pc])) for pc in top.tolist() if counts[pc]]
+
+    def to_dict(self, program: Optional["Program"] = None) -> dict:
+        data = {
+            "runs": self.runs,
+            "counts": self.counts.tolist(),
+            "path": self.path.tolist(),
+            "acc": self.acc.tolist(),
+            "loop_body": self.loop_body.tolist(),
+        }
+        if program is not None:
+            data["instructions"] = [program.instruction(pc) for pc in range(len(program))]
+        return data
+
+    def dump(self, path: Union[str, Path], program: Optional["Program"] = None) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(program)))
+
+    def summary(self, program: "Program") -> str:
+        lines = [f"{self.runs} runs, the last took {len(self.path)} steps"]
+        body = self.loop_body
+        if len(body):
+            lines.append(
+                f"loop of {len(body)} instructions from {body[0]}, "
+                f"acc {self.acc[self.loop_start - 1] if self.loop_start else 0} -> {self.acc[-1]}"
+            )
+        for pc, count in self.hottest():
+            lines.append(f"{pc:8} {program.instruction(pc):<10} {count:8}")
+        return "\n".join(lines)
+
+
+class Program:
+    """Boot code compiled to parallel arrays of opcodes and operands.
+
+    ``run()`` returns the accumulator once the program steps past its last
+    instruction, or raises ``InfiniteLoopError`` with the accumulator when
+    an instruction would run a second time.
+
+    """
+    def __init__(self, data: str):
+        buf = as_array(data.strip())
+        starts = np.concatenate(([0], np.flatnonzero(buf == ord("\n")) + 1))
+        if not len(buf):
+            starts = starts[:0]
+        # every line is "<op> <sign><number>", the op told apart by its first letter
+        ops = FIRST_LETTER_OPS[buf[starts]] if len(buf) else np.zeros(0, dtype=np.uint8)
+        known = (ops != UNKNOWN) & (starts + 3 < len(buf))
+        if len(starts) and known.all():
+            known &= (buf[starts + 1] == OP_SECOND[ops]) & (buf[starts + 2] == OP_THIRD[ops])
+            known &= buf[starts + 3] == ord(" ")
+        if not known.all():
+            line = buf[starts[np.argmin(known)]:].tobytes().split(b"\n")[0].decode()
+            raise ValueError(f"unknown operation in {line!r}")
+        args = integers(buf)
+        if len(args) != len(starts):
+            raise ValueError("every instruction needs an operation and one argument")
+
+        self.ops = bytearray(ops.tobytes())
+        self.args = array("q", args.tobytes())
         self.acc = 0
-        self.visited = set()
-        super().__init__(*args, **kwargs)
-
-    def peek(self):
-        value = self.read(1)
-        self.seek(self.tell() - 1, 0)
-        return value
-
-    def peekback(self):
-        self.seek(self.tell() - 1, 0)
-        return self.read(1)
-
-    def jmp(self, offset):
-        if offset > 0:
-            for _ in range(offset - 1):
-                self.readline()
-        else:
-            for _ in range(abs(offset) + 1):
-                self.prevline()
-
-    def prevline(self):
-        self.seek(self.tell() - 6, 0)
-        prev = self.peekback()
-        while prev != '\n':
-            self.seek(self.tell() - 1, 0)
-            prev = self.peekback()
-
-    def step(self):
-        """Process the next line."""
-        if not self.peek():
-            print("Done!")
-            raise ProgramFinishedError("Done!")
-        if self.tell() in self.visited:
-            raise InfiniteLoopError(self.acc)
-        self.visited.add(self.tell())
-        command = self.readline()
-        if m := self.acc_pattern.match(command):
-            # print(f"  command is acc: {command.strip()}")
-            sign, offset = m.groups()
-            offset = int(offset)
-            if sign == '-':
-                offset = offset * -1
-            self.acc += offset
-        elif m := self.jmp_pattern.match(command):
-            # print(f"  command is jmp: {command.strip()}")
-            sign, offset = m.groups()
-            offset = int(offset)
-            if sign == '-':
-                offset = offset * -1
-            self.jmp(offset)
-
-        # print(f"{command.strip()} -> {self.tell()} acc: {self.acc}")
-
-    def run(self):
-        try:
-            while True:
-                self.step()
-        except ProgramFinishedError:
-            return self.acc
-
+        self.pc = 0
+        self.visited = bytearray(len(self.ops))
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def next_pcs(self) -> np.ndarray:
+        """Where each instruction goes next, as they are now."""
+        ops = np.frombuffer(self.ops, dtype=np.uint8)
+        args = np.frombuffer(self.args, dtype=np.int64)
+        pcs = np.arange(len(ops))
+        return np.where(ops == JMP, pcs + args, pcs + 1)
+
+    def instruction(self, pc: int) -> str:
+        return f"{MNEMONICS[self.ops[pc]]} {self.args[pc]:+d}"
+
+    def run(self, trace: Optional[Trace] = None) -> int:
+        if trace is not None:
+            return self._run_traced(trace)
+        ops = self.ops
+        # a list hands out the same int objects instead of boxing new ones
+        args = self.args.tolist()
+        end = len(ops)
+        visited = bytearray(end)
+        self.visited = visited
+        jmp, acc_op = JMP, ACC
+        pc = acc = 0
+        while pc < end:
+            if visited[pc]:
+                self.pc, self.acc = pc, acc
+                raise InfiniteLoopError(acc)
+            visited[pc] = 1
+            op = ops[pc]
+            if op == jmp:
+                pc += args[pc]
+                if pc < 0:
+                    self.pc, self.acc = pc, acc
+                    raise JumpOutOfBoundsError(f"jumped to {pc}, before the first instruction")
+            elif op == acc_op:
+                acc += args[pc]
+                pc += 1
+            else:
+                pc += 1
+        self.pc, self.acc = pc, acc
+        return acc
+
+    def _run_traced(self, trace: Trace) -> int:
+        """``run()``, and recording every step into ``trace``."""
+        if len(trace.counts) != len(self):
+            raise ValueError(f"the trace is for {len(trace.counts)} instructions, not {len(self)}")
+        ops = self.ops
+        args = self.args
+        end = len(ops)
+        # the step each pc first ran at, and so where a loop starts
+        first_step = array("q", [-1]) * end
+        trace.runs += 1
+        trace.path = path = array("q")
+        trace.acc = accs = array("q")
+        trace.loop_start = None
+        counts = trace.counts
+        pc = acc = 0
+        while pc < end:
+            if first_step[pc] != -1:
+                trace.loop_start = first_step[pc]
+                break
+            first_step[pc] = len(path)
+            counts[pc] += 1
+            path.append(pc)
+            op = ops[pc]
+            if op == JMP:
+                pc += args[pc]
+            else:
+                if op == ACC:
+                    acc += args[pc]
+                pc += 1
+            accs.append(acc)
+            if pc < 0:
+                break
+        self.visited = bytearray(first_step[i] != -1 for i in range(end))
+        self.pc, self.acc = pc, acc
+        if pc < 0:
+            raise JumpOutOfBoundsError(f"jumped to {pc}, before the first instruction")
+        if pc < end:
+            raise InfiniteLoopError(acc)
+        return acc
 
 
 # -- part 1
@@ -118,6 +253,28 @@ def test_part1():
         p.run()
     except InfiniteLoopError as err:
         assert int(str(err)) == 5
+        assert err.acc == 5
+    assert p.pc == 1 and p.instruction(p.pc) == "acc +1"
+    assert p.visited.count(1) == 7
+
+
+def test_trace():
+    program = Program(TEST_DATA)
+    trace = Trace(len(program))
+    with pytest.raises(InfiniteLoopError):
+        program.run(trace)
+    assert trace.path.tolist() == [0, 1, 2, 6, 7, 3, 4]
+    assert trace.acc.tolist() == [0, 1, 1, 2, 2, 5, 5]
+    assert trace.loop_body.tolist() == [1, 2, 6, 7, 3, 4]
+    assert program.visited == bytearray([1, 1, 1, 1, 1, 0, 1, 1, 0])
+
+    program.ops[7] = NOP
+    assert program.run(trace) == 8
+    assert trace.runs == 2 and trace.loop_body.tolist() == []
+    assert trace.hottest(2) == [(0, 2), (1, 2)]
+    assert trace.counts.tolist() == [2, 2, 2, 1, 1, 0, 2, 2, 1]
+    assert trace.to_dict(program)["instructions"][7] == "nop -4"
+    assert "2 runs" in trace.summary(program)
 
 
 def part1(data: str):
@@ -165,35 +322,131 @@ nop -4
 acc +6"""
 
 
-# def test_terminate():
-#     p = Program(TEST_DATA2)
-#     p.run()
-
-
-def part2(data: str):
-    lines = data.strip().split("\n")
-    for i, line in enumerate(lines):
-        new = None
-        current = None
-        if line.startswith("nop"):
-            new = "jmp"
-            current = "nop"
-        elif line.startswith("jmp"):
-            new = "nop"
-            current = "jmp"
-        if new is None or current is None:
+def test_part2():
+    assert part2(TEST_DATA2) == 8
+    assert Program(TEST_DATA3).run() == 8
+    with pytest.raises(JumpOutOfBoundsError):
+        Program("nop +0\njmp -2").run()
+
+
+@pytest.mark.parametrize("data", [
+    "nop +0\nmov +1", "nop +0\nacc", "ac +1", "accx +1", "jmp +1 +2",
+])
+def test_bad_program(data):
+    with pytest.raises(ValueError):
+        Program(data)
+
+
+class Repair(NamedTuple):
+    pc: int
+    # the instruction before and after the flip
+    before: str
+    after: str
+    # what the repaired program leaves in the accumulator
+    acc: int
+
+
+def terminating(program: Program) -> bytearray:
+    """Flags of the instructions that, run as they are, lead past the end.
+
+    Every instruction has one successor, so these are found backwards from
+    the end: whatever jumps or steps into the set is in it too.
+
+    """
+    end = len(program)
+    successors = np.minimum(program.next_pcs(), end)
+    # jumps to before the start lead nowhere
+    sources = np.flatnonzero(successors >= 0)
+    targets = successors[sources]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(targets, minlength=end + 1)))).tolist()
+    # the instructions going to each pc, grouped by it with a counting sort
+    predecessors = [0] * len(sources)
+    fill = offsets[:-1]
+    for before, pc in zip(sources.tolist(), targets.tolist()):
+        predecessors[fill[pc]] = before
+        fill[pc] += 1
+
+    found = bytearray(end + 1)
+    found[end] = 1
+    queue = [end]
+    for pc in queue:
+        for before in predecessors[offsets[pc]:offsets[pc + 1]]:
+            if not found[before]:
+                found[before] = 1
+                queue.append(before)
+    return found[:end]
+
+
+def repair(program: Program) -> Optional[Repair]:
+    """Flip the one ``jmp`` or ``nop`` on the looping path that makes the program end.
+
+    The path from the start is walked once, and at each ``jmp`` or ``nop``
+    the flipped instruction's successor is checked against the
+    ``terminating`` set, so the whole repair is linear in the program size.
+    None if the program already ends, or no single flip helps.
+
+    """
+    ends = terminating(program)
+    end = len(program)
+    if not end or ends[0]:
+        return None
+    ops, args = program.ops, program.args
+    seen = bytearray(end)
+    pc = 0
+    while 0 <= pc < end and not seen[pc]:
+        seen[pc] = 1
+        op = ops[pc]
+        if op != ACC:
+            flipped = pc + args[pc] if op == NOP else pc + 1
+            if flipped >= end or flipped >= 0 and ends[flipped]:
+                before = program.instruction(pc)
+                ops[pc] = JMP if op == NOP else NOP
+                try:
+                    return Repair(pc, before, program.instruction(pc), program.run())
+                finally:
+                    ops[pc] = op
+        pc = pc + args[pc] if op == JMP else pc + 1
+    return None
+
+
+def test_repair():
+    fixed = repair(Program(TEST_DATA2))
+    assert fixed == Repair(7, "jmp -4", "nop -4", 8)
+    assert repair(Program(TEST_DATA3)) is None
+
+    # against flipping every instruction in turn
+    rng = random.Random(8)
+    for _ in range(200):
+        size = rng.randint(1, 12)
+        data = "\n".join(
+            f"{rng.choice(['nop', 'acc', 'jmp'])} {rng.randint(-size, size):+d}"
+            for _ in range(size))
+        program = Program(data)
+        try:
+            program.run()
             continue
+        except (InfiniteLoopError, JumpOutOfBoundsError):
+            pass
+        working = set()
+        for pc, op in enumerate(program.ops):
+            if op != ACC:
+                program.ops[pc] = NOP if op == JMP else JMP
+                try:
+                    working.add((pc, program.run()))
+                except (InfiniteLoopError, JumpOutOfBoundsError):
+                    pass
+                program.ops[pc] = op
+        fixed = repair(program)
+        if fixed is None:
+            assert not working
+        else:
+            assert (fixed.pc, fixed.acc) in working
+            assert program.ops == Program(data).ops
 
-        lines[i] = line.replace(current, new)
 
-        mutated_data = "\n".join(lines)
-        p = Program(mutated_data)
-        try:
-            result = p.run()
-        except InfiniteLoopError:
-            lines[i] = line
-        else:
-            return result
+def part2(data: str):
+    fixed = repair(Program(data))
+    return fixed.acc if fixed is not None else None
 
 
 if __name__ == "__main__":
@@ -201,4 +454,21 @@ if __name__ == "__main__":
     data = input_file.read_text()
 
     print(part1(data))
-    print(part2(data))
+    # ``--profile [path]`` shows where part 1 goes round, and saves it all to path
+    if "--profile" in sys.argv:
+        program = Program(data)
+        trace = Trace(len(program))
+        try:
+            program.run(trace)
+        except InfiniteLoopError:
+            pass
+        print(trace.summary(program))
+        rest = sys.argv[sys.argv.index("--profile") + 1:]
+        if rest:
+            trace.dump(rest[0], program)
+    fixed = repair(Program(data))
+    if fixed is None:
+        print("no single flip makes the program end")
+    else:
+        print(f"flipped {fixed.before} to {fixed.after} at {fixed.pc}")
+        print(fixed.acc)
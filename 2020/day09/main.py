@@ -4,9 +4,16 @@ https://adventofcode.com/2020/day/9
 
 """
 import collections
+import sys
 from itertools import combinations
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc.ints import integers  # noqa: E402
+
 
 # -- part 1
 
@@ -35,7 +42,7 @@ TEST_DATA = """35
 
 def first_invalid_number(data, buffer_size):
     buffer = collections.deque(maxlen=buffer_size)
-    numbers = [int(x) for x in data.strip().split("\n")]
+    numbers = integers(data).tolist()
     preamble = numbers[:buffer_size]
     for number in preamble:
         buffer.append(number)
@@ -57,7 +64,7 @@ def part1(data: str):
 
 def find_contiguous_range(data: str, target: int):
     buffer = collections.deque()
-    numbers = [int(x) for x in data.strip().split("\n")]
+    numbers = integers(data).tolist()
     for number in numbers:
         if len(buffer) >= 2 and sum(buffer) == target:
             return min(buffer) + max(buffer)
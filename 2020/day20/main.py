@@ -3,14 +3,23 @@
 https://adventofcode.com/2020/day/20
 
 """
-from copy import copy, deepcopy
+import sys
+from collections import Counter
+from copy import copy
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 from operator import mul
 from functools import reduce
 
+import numpy as np
 import pytest
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc.grid import Grid  # noqa: E402
+
 
 TEST_DATA = """Tile 2311:
 ..##.#..#.
@@ -126,55 +135,11 @@ def test_part1():
 
 
 def reverse(old: str) -> str:
-    new = ""
-    for c in old:
-        new = c + new
-    return new
-
-
-def flip_grid_x(grid):
-    for row in grid:
-        row.reverse()
-
-
-def flip_grid_y(grid):
-    grid.reverse()
-
-
-def rotate_grid_cw(grid):
-    rows = deepcopy(grid)
-    rows.reverse()
-    new_rows = []
-    for i in range(len(rows)):
-        new_rows.append([row[i] for row in rows])
-    return new_rows
-
-
-def all_alignments(grid):
-    yield grid
-    grid = rotate_grid_cw(grid)
-    yield grid
-    grid = rotate_grid_cw(grid)
-    yield grid
-    grid = rotate_grid_cw(grid)
-    yield grid
-    grid = rotate_grid_cw(grid)
-    flip_grid_x(grid)
-    print("fx", end=" ")
-    grid = rotate_grid_cw(grid)
-    yield grid
-    grid = rotate_grid_cw(grid)
-    yield grid
-    grid = rotate_grid_cw(grid)
-    yield grid
-    grid = rotate_grid_cw(grid)
-    flip_grid_y(grid)
-    print("fy", end=" ")
-    flip_grid_x(grid)
-    print("fx", end=" ")
-    grid = rotate_grid_cw(grid)
-    grid = rotate_grid_cw(grid)
-    yield grid
+    return old[::-1]
+
+
+def as_str(cells: np.ndarray) -> str:
+    return cells.tobytes().decode()
 
 
 class Tile:
@@ -184,23 +149,14 @@ class Tile:
         self.data = data.strip()
         self.id = int(self.data.split("\n")[0].strip("Tile :"))
 
-        self.grid: List[List[str]] = []
-        rows = self.data.split("\n")[1:]
-        for row in rows:
-            self.grid.append([c for c in row])
+        self.grid = Grid.parse(self.data.split("\n", 1)[1])
 
         self.links = []
         self.lookup[self.id] = self
 
     @property
     def grid_str(self) -> str:
-        s = ""
-        for row in self.grid:
-            s = s + "".join(row)
-            s = s + "\n"
-        if s.endswith("\n"):
-            s = s[:-1]
-        return s
+        return str(self.grid)
 
     @property
     def edges(self) -> List[str]:
@@ -213,11 +169,11 @@ class Tile:
         # lf ^
         #    |
         # This means that the edges will not change if the tile is rotated.
-        return ["".join(e) for e in [
-            self.grid[0],                                   # tp
-            list(reversed(self.grid[-1])),                  # bt
-            list(reversed([row[0] for row in self.grid])),  # lf
-            [row[-1] for row in self.grid],                 # rt
+        return [as_str(e) for e in [
+            self.grid.row(0),         # tp
+            self.grid.row(-1)[::-1],  # bt
+            self.grid.col(0)[::-1],   # lf
+            self.grid.col(-1),        # rt
         ]]
 
     @property
@@ -260,19 +216,13 @@ class Tile:
                 return other
 
     def rotate_cw(self):
-        rows = deepcopy(self.grid)
-        rows.reverse()
-        new_rows = []
-        for i in range(len(rows)):
-            new_rows.append([row[i] for row in rows])
-        self.grid = new_rows
+        self.grid = self.grid.rotate()
 
     def flip_x(self):
-        for row in self.grid:
-            row.reverse()
+        self.grid = self.grid.flip_x()
 
     def flip_y(self):
-        self.grid.reverse()
+        self.grid = self.grid.flip_y()
 
     def flip_aligned(self, other: "Tile"):
         return len(set(self.edges).intersection([reverse(e) for e in other.edges])) == 1
@@ -308,10 +258,11 @@ def part1(data: str) -> int:
     all_edges = []
     for t in tiles:
         all_edges.extend(t.edgesf)
+    edge_counts = Counter(all_edges)
     for t in tiles:
         t.shared_edges = 0
         for edge in t.edgesf:
-            if all_edges.count(edge) > 1:
+            if edge_counts[edge] > 1:
                 t.shared_edges += 1
 
     # Because of flipping, shared edges is 4 instead of 2
@@ -414,38 +365,19 @@ SEA_MONSTER = """                  #
  #  #  #  #  #  #   """
 
 
-def monster_count(grid: List[List[str]]) -> (int, int):
-    rows = SEA_MONSTER.split("\n")
-    sm_grid = []
-    for row in rows:
-        sm_grid.append([x for x in row])
-    sm_coord = []
-    for y, row in enumerate(sm_grid):
-        for x, c in enumerate(row):
-            if c == "#":
-                sm_coord.append((x, y))
-
-    grid_w = len(grid[0])
-    grid_h = len(grid)
-    sm_w = len(sm_grid[0])
-    sm_h = len(sm_grid)
-
-    count = 0
-    for x in range(grid_w - sm_w + 1):
-        for y in range(grid_h - sm_h + 1):
-            # print(f"checking {x}, {y}")
-            for sm_x, sm_y in sm_coord:
-                if grid[y + sm_y][x + sm_x] != "#":
-                    break
-            else:
-                count += 1
-
-    total_roughness = 0
-    for row in grid:
-        for c in row:
-            if c == "#":
-                total_roughness += 1
+def monster_count(grid: Grid) -> Tuple[int, int]:
+    monster = Grid.parse(SEA_MONSTER.replace(" ", "."))
+    sm_h, sm_w = monster.shape
+    rough = grid.mask("#")
+    grid_h, grid_w = rough.shape
+
+    # a monster starts at every position where all of its cells are rough
+    starts = np.ones((grid_h - sm_h + 1, grid_w - sm_w + 1), dtype=bool)
+    for sm_x, sm_y in monster.find_all("#"):
+        starts &= rough[sm_y:sm_y + starts.shape[0], sm_x:sm_x + starts.shape[1]]
+    count = int(starts.sum())
 
+    total_roughness = int(rough.sum())
     monster_roughness = SEA_MONSTER.count("#")
     roughness = total_roughness - (monster_roughness * count)
     return count, roughness
@@ -457,10 +389,11 @@ def part2(data: str) -> int:
     all_edges = []
     for t in tiles:
         all_edges.extend(t.edgesf)
+    edge_counts = Counter(all_edges)
     for t in tiles:
         t.shared_edges = 0
         for edge in t.edgesf:
-            if all_edges.count(edge) > 1:
+            if edge_counts[edge] > 1:
                 t.shared_edges += 1
 
     # Because of flipping, shared edges is double the actual number, since the
@@ -479,11 +412,12 @@ def part2(data: str) -> int:
     assert len(edge_tiles) == (square_root - 2) * 4
     assert len(middle_tiles) == (square_root - 2) ** 2
 
+    edge_sets = {t.id: set(t.edgesf) for t in tiles}
     for t in tiles:
         for other in tiles:
             if t is other:
                 continue
-            if len(set(t.edgesf).intersection(other.edgesf)) == 2:
+            if len(edge_sets[t.id].intersection(edge_sets[other.id])) == 2:
                 t.links.append(other.id)
 
     for t in tiles:
@@ -544,41 +478,20 @@ def part2(data: str) -> int:
         for r in tiles
     ])
 
-    # get final image from tile grid
-    grid = []
-    for tile_row in tiles:
-        combined_row = []
-        for x in range(len(tile_row[0].grid[1:-1])):
-            combined_row.append([])
-        for t in tile_row:
-            for i, row in enumerate(t.grid[1:-1]):
-                combined_row[i].extend(row[1:-1])
-        grid.extend(combined_row)
+    # get final image from tile grid, each tile without its border
+    image = Grid(np.block([
+        [t.grid.cells[1:-1, 1:-1] for t in tile_row]
+        for tile_row in tiles
+    ]))
 
     # print grid for debugging
-    s = ""
-    for row in grid:
-        s = s + "".join(row)
-        s = s + "\n"
-    if s.endswith("\n"):
-        s = s[:-1]
-    print(s)
+    print(image)
 
     # look for sea monsters
     counts = {}
-
-    seen = []
-
-    for g in all_alignments(grid):
+    for g in image.orientations():
         count, roughness = monster_count(g)
         counts[count] = roughness
-        for s in seen:
-            if g == s:
-                print("- seen -", end=" ")
-                break
-        else:
-            seen.append(deepcopy(g))
-    print(len(seen))
     return counts[max(counts.keys())]
 
 
@@ -4,6 +4,7 @@ https://adventofcode.com/2020/day/23
 
 """
 import logging
+from pathlib import Path
 from typing import List, Optional
 
 
@@ -220,7 +221,7 @@ def test_100_moves():
 
 
 def part1(data: str):
-    game = Game([int(n) for n in data])
+    game = Game([int(n) for n in data.strip()])
     for _ in range(100):
         game.move()
     return game.cups.answer()
@@ -230,7 +231,7 @@ def part1(data: str):
 
 
 def part2(data: str):
-    starting_numbers = [int(n) for n in data]
+    starting_numbers = [int(n) for n in data.strip()]
     other_numbers = list(range(max(starting_numbers) + 1, 1000001))
     cups = starting_numbers + other_numbers
     game = Game(cups)
@@ -241,7 +242,8 @@ def part2(data: str):
 
 
 def main():
-    data = "792845136"
+    input_file = Path(__file__).parent / "input"
+    data = input_file.read_text()
 
     print(part1(data))  # 98742365
     print(part2(data))  # 294320513093
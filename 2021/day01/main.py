@@ -1,5 +1,13 @@
+import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc.inputs import InputFile  # noqa: E402
+from aoc.ints import integers  # noqa: E402
+
 
 TEST_INPUT = """199
 200
@@ -15,14 +23,12 @@ TEST_INPUT = """199
 
 
 def parse(data: str) -> list[int]:
-    return [int(x) for x in data.split("\n") if x]
+    return integers(data).tolist()
 
 
 def read_input() -> list[int]:
-    input_file = Path(__file__).parent / "input"
-    contents = input_file.read_text()
-    depths = parse(contents)
-    return depths
+    with InputFile(Path(__file__).parent / "input") as f:
+        return integers(f.buffer).tolist()
 
 
 def part1(depths: list[int]) -> int:
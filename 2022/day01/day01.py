@@ -1,5 +1,14 @@
+import sys
 from pathlib import Path
 
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc.ints import integers_by_record, sums  # noqa: E402
+
 
 def read_input():
     input_file = Path(__file__).absolute().parent / "input"
@@ -7,26 +16,21 @@ def read_input():
     return data
 
 
+def calories_per_elf(data: str) -> np.ndarray:
+    return sums(*integers_by_record(data.strip()))
+
+
 def part1():
     data = read_input()
-    print(
-        max([
-            sum([int(f) for f in foods.split()])
-            for foods in data.strip().split("\n\n")
-        ])
-    )
+    print(int(calories_per_elf(data).max()))
 
 
 def part2():
     data = read_input()
-    caleries_per_elf = [
-        sum([int(f) for f in foods.split()])
-        for foods in data.strip().split("\n\n")
-    ]
-    caleries_per_elf.sort(reverse=True)
-    a, b, c, *_ = caleries_per_elf
-    print(sum([a, b, c]))
+    caleries_per_elf = np.sort(calories_per_elf(data))
+    print(int(caleries_per_elf[-3:].sum()))
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    part1()
+    part2()
@@ -62,5 +62,6 @@ def part2():
     print(total)
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    part1()
+    part2()
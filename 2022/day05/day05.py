@@ -100,5 +100,6 @@ def part2():
     print(result)
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    part1()
+    part2()
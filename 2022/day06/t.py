@@ -66,5 +66,6 @@ def part2():
     print(q.place)
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    part1()
+    part2()
@@ -165,5 +165,6 @@ def part2():
     print(min([d.size for d in dirs]))
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    part1()
+    part2()
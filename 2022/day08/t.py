@@ -1,5 +1,14 @@
+import sys
 from pathlib import Path
 
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc.grid import Grid, shift  # noqa: E402
+
 
 TEST_INPUT = """30373
 25512
@@ -12,66 +21,47 @@ def read_input():
     input_file = Path(__file__).absolute().parent / "input"
     data = input_file.read_text()
     # data = TEST_INPUT
-    return data.strip().split("\n")
+    return Grid.parse(data)
+
+
+def heights(grid: Grid) -> np.ndarray:
+    return grid.cells.astype(np.int8) - ord("0")
+
+
+def visible_from_left(trees: np.ndarray) -> np.ndarray:
+    tallest = np.maximum.accumulate(trees, axis=1)
+    # tallest tree anywhere to the left, -1 on the edge so edge trees are visible
+    tallest_before = shift(tallest, -1, 0, -1)
+    return trees > tallest_before
+
+
+def viewing_distance_left(trees: np.ndarray) -> np.ndarray:
+    distance = np.zeros(trees.shape, dtype=np.int64)
+    looking = np.ones(trees.shape, dtype=bool)
+    columns = np.arange(trees.shape[1])
+    for d in range(1, trees.shape[1]):
+        looking &= columns >= d
+        distance += looking
+        looking &= shift(trees, -d, 0) < trees
+    return distance
 
 
 def part1():
-    rows = read_input()
-
-    min_x = 0
-    max_x = len(rows[0]) - 1
-    min_y = 0
-    max_y = len(rows) - 1
-
-    visible = 0
-    for y, row in enumerate(rows):
-        for x, tree in enumerate(row):
-            if x == min_x or x == max_x or y == min_y or y == max_y:
-                visible += 1
-                continue
-            left = row[:x]
-            right = row[x+1:]
-            up = "".join([r[x] for r in rows[:y]])
-            down = "".join([r[x] for r in rows[y+1:]])
-            # print(f"{x},{y} ({tree}) left={left}, right={right}, up={up}, down={down}")
-            if max(left) < tree:
-                visible += 1
-                continue
-            if max(right) < tree:
-                visible += 1
-                continue
-            if max(up) < tree:
-                visible += 1
-                continue
-            if max(down) < tree:
-                visible += 1
-                continue
-    print(visible)
+    trees = heights(read_input())
+    visible = np.zeros(trees.shape, dtype=bool)
+    for turns in range(4):
+        visible |= np.rot90(visible_from_left(np.rot90(trees, turns)), -turns)
+    print(int(visible.sum()))
 
 
 def part2():
-    rows = read_input()
-
-    max_score = 0
-    for y, row in enumerate(rows):
-        for x, tree in enumerate(row):
-            left = [t for t in row[:x]]
-            left.reverse()
-            right = [t for t in row[x + 1:]]
-            up = [r[x] for r in rows[:y]]
-            up.reverse()
-            down = [r[x] for r in rows[y + 1:]]
-            scores = [0, 0, 0, 0]
-            for i, trees in enumerate([left, right, up, down]):
-                for t in trees:
-                    scores[i] += 1
-                    if t >= tree:
-                        break
-            score = scores[0] * scores[1] * scores[2] * scores[3]
-            max_score = max(max_score, score)
-            # print(f"{x},{y} ({tree}) left={left}, right={right}, up={up}, down={down}")
-    print(max_score)
-
-
-part1()
-part2()
+    trees = heights(read_input())
+    score = np.ones(trees.shape, dtype=np.int64)
+    for turns in range(4):
+        score *= np.rot90(viewing_distance_left(np.rot90(trees, turns)), -turns)
+    print(int(score.max()))
+
+
+if __name__ == "__main__":
+    part1()
+    part2()
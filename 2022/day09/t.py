@@ -222,5 +222,6 @@ def part2():
     print(len(sim.visited))
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    part1()
+    part2()
@@ -179,7 +179,8 @@ def parse_i(i: str) -> I:
         return AddX(int(v))
 
 
-INPUT = (Path(__file__).absolute().parent / "input").read_text()
+def read_file() -> str:
+    return (Path(__file__).absolute().parent / "input").read_text()
 
 
 def read_input(data: str):
@@ -219,7 +220,7 @@ class Cpu:
 
 
 def part1():
-    instructions = read_input(INPUT)
+    instructions = read_input(read_file())
     cpu = Cpu(instructions, [20, 60, 100, 140, 180, 220])
     result = 0
     for x in cpu.run():
@@ -285,11 +286,12 @@ class Cpu2:
 
 
 def part2():
-    instructions = read_input(INPUT)
+    instructions = read_input(read_file())
     cpu = Cpu2(instructions)
     for x in cpu.run():
         print(x, end="")
 
 
-part1()
-part2()
+if __name__ == "__main__":
+    part1()
+    part2()
@@ -84,7 +84,8 @@ def part2(data):
     print("total:", total)
 
 
-part1(DATA)
-part1(read_input())
-part2(DATA2)
-part2(read_input())
+if __name__ == "__main__":
+    part1(DATA)
+    part1(read_input())
+    part2(DATA2)
+    part2(read_input())
@@ -7,9 +7,6 @@ def read_input():
     return data
 
 
-INPUT = read_input()
-
-
 DATA = """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
 Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
 Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
@@ -91,7 +88,9 @@ def part2(data):
     print(total)
 
 
-part1(DATA)
-part1(INPUT)
-part2(DATA2)
-part2(INPUT)
+if __name__ == "__main__":
+    INPUT = read_input()
+    part1(DATA)
+    part1(INPUT)
+    part2(DATA2)
+    part2(INPUT)
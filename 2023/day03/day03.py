@@ -1,7 +1,16 @@
 import re
-import time
+import sys
 from pathlib import Path
 
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc import timing  # noqa: E402
+from aoc.grid import Grid  # noqa: E402
+
 
 def read_input():
     input_file = Path(__file__).absolute().parent / "input"
@@ -9,12 +18,6 @@ def read_input():
     return data
 
 
-start = time.perf_counter()
-INPUT = read_input()
-read_input_elapsed = time.perf_counter() - start
-print(f"read: {read_input_elapsed*1000:.4f} ms")
-
-
 DATA = """467..114..
 ...*......
 ..35..633.
@@ -27,49 +30,35 @@ DATA = """467..114..
 .664.598.."""
 
 
+def part_numbers(grid: Grid) -> tuple[np.ndarray, np.ndarray]:
+    """The numbers in the grid, and an array the shape of the grid holding the
+    index of the number each digit belongs to, -1 elsewhere.
+
+    """
+    # a "." after every row keeps a number at the end of one row apart from
+    # one at the start of the next
+    padded = np.pad(grid.cells, ((0, 0), (0, 1)), constant_values=ord("."))
+    labels = np.full(padded.size, -1, dtype=np.int64)
+    numbers = []
+    for i, m in enumerate(re.finditer(rb"\d+", padded.tobytes())):
+        labels[m.start():m.end()] = i
+        numbers.append(int(m.group()))
+    return np.array(numbers, dtype=np.int64), labels.reshape(padded.shape)[:, :-1]
+
+
+def symbols(grid: Grid) -> np.ndarray:
+    digits = (grid.cells >= ord("0")) & (grid.cells <= ord("9"))
+    return ~digits & (grid.cells != ord("."))
+
+
 def part1(data):
-    total = 0
-    lines = data.strip().split()
-    for i, line in enumerate(lines):
-        # print(i)
-        if i == 0:
-            prev = "." * len(line)
-        else:
-            prev = lines[i-1]
-        if i == len(lines)-1:
-            next = "." * len(line)
-        else:
-            next = lines[i+1]
-        # print("prev:", prev)
-        # print("line:", line)
-        # print("next:", next)
-
-        for m in re.finditer(r"(\d+)", line):
-            # print(m)
-            part_num = int(m.group(0))
-            # print(int(m.group(0)))
-            start, end = m.span()
-            # print(part_num, "->", start, end)
-            seg_prev = prev[max(0,start-1):min(end+1, len(prev))]
-            seg_curr = line[max(0,start-1):min(end+1, len(line))]
-            seg_next = next[max(0,start-1):min(end+1, len(next))]
-            # print()
-            # print("  ", seg_prev)
-            # print("  ", seg_curr)
-            # print("  ", seg_next)
-            # print()
-            for char in seg_prev + seg_curr + seg_next:
-                if char.isdigit():
-                    continue
-                if char == ".":
-                    continue
-                else:
-                    total += part_num
-                    break
+    grid = Grid.parse(data)
+    numbers, labels = part_numbers(grid)
+    near_symbol = Grid.dilate(symbols(grid)) & (labels >= 0)
+    total = int(numbers[np.unique(labels[near_symbol])].sum())
     print("Sum:", total)
 
 
-
 DATA2 = """467..114..
 ...*......
 ..35..633.
@@ -83,62 +72,29 @@ DATA2 = """467..114..
 
 
 def part2(data):
-    total = 0
-    lines = data.strip().split()
-    for i, line in enumerate(lines):
-        if i == 0:
-            prev = "." * len(line)
-        else:
-            prev = lines[i - 1]
-        if i == len(lines) - 1:
-            next = "." * len(line)
-        else:
-            next = lines[i + 1]
-        y = i
-        for x, char in enumerate(line):
-            if char != "*":
-                continue
-            # print(f"found * at {x},{y}")
-
-            adjacent = []
-
-            for m in re.finditer(r"(\d+)", prev):
-                # print("prev:")
-                part_num = int(m.group(0))
-                start, end = m.span()
-                # print("  ", part_num, start, end, x)
-                if x >= start-1 and x <= end:
-                    # print("==", part_num)
-                    adjacent.append(part_num)
-            for m in re.finditer(r"(\d+)", line):
-                part_num = int(m.group(0))
-                start, end = m.span()
-                if x == start-1 or x == end:
-                    # print("curr:", part_num)
-                    adjacent.append(part_num)
-            for m in re.finditer(r"(\d+)", next):
-                # print("next:")
-                part_num = int(m.group(0))
-                start, end = m.span()
-
-                # print("  ", part_num, start, end, x)
-                if x >= start-1 and x <= end:
-                    # print("==", part_num)
-                    adjacent.append(part_num)
-
-            # print("adj:", adjacent)
-            if len(adjacent) == 2:
-                ratio = adjacent[0] * adjacent[1]
-                total += ratio
-
-    print("Sum:", total)
-
-
-part1(DATA)
-part1(INPUT)
-part2(DATA2)
-part2(INPUT)
-end = time.perf_counter()
-elapsed = end - start
-print(f"Took {elapsed*1000:.4f} ms")
+    grid = Grid.parse(data)
+    numbers, labels = part_numbers(grid)
+    ys, xs = np.nonzero(grid.mask("*"))
+    around = np.sort(Grid.neighbor_values(labels, xs, ys), axis=1)
+    # each number once per gear, however many of its digits touch it
+    first = around >= 0
+    first[:, 1:] &= around[:, 1:] != around[:, :-1]
+    gears = first.sum(axis=1) == 2
+    ratios = np.where(first, numbers[around], 1)[gears].prod(axis=1)
+    print("Sum:", int(ratios.sum()))
+
+
+if __name__ == "__main__":
+    timing.enable()
+    with timing.phase("read"):
+        INPUT = read_input()
+    with timing.phase("part1 example"):
+        part1(DATA)
+    with timing.phase("part1"):
+        part1(INPUT)
+    with timing.phase("part2 example"):
+        part2(DATA2)
+    with timing.phase("part2"):
+        part2(INPUT)
+    print(timing.summary())
 
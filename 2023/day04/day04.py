@@ -1,6 +1,15 @@
-import time
+import sys
 from pathlib import Path
 
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc import timing  # noqa: E402
+from aoc.ints import integers, integers_by_line  # noqa: E402
+
 
 def read_input():
     input_file = Path(__file__).absolute().parent / "input"
@@ -8,11 +17,6 @@ def read_input():
     return data
 
 
-start_time = time.perf_counter()
-INPUT = read_input()
-read_time = time.perf_counter() - start_time
-
-
 DATA = """Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53
 Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19
 Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1
@@ -21,24 +25,28 @@ Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36
 Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11"""
 
 
+def card_matches(data: str) -> np.ndarray:
+    """How many of your numbers are winning numbers, for every card."""
+    data = data.strip()
+    values, offsets = integers_by_line(data)
+    per_card = np.diff(offsets)
+    if (per_card != per_card[0]).any():
+        raise ValueError("cards don't all have the same number of numbers")
+    # the card number, then the winning numbers up to the "|", then yours
+    winning = len(integers(data[:data.index("|")])) - 1
+    cards = values.reshape(len(per_card), per_card[0])
+    winning_nums = cards[:, 1:1 + winning]
+    # sorted, so a number you have twice is only counted once, like a set would
+    your_nums = np.sort(cards[:, 1 + winning:], axis=1)
+    matched = (your_nums[:, :, None] == winning_nums[:, None, :]).any(axis=2)
+    matched[:, 1:] &= your_nums[:, 1:] != your_nums[:, :-1]
+    return matched.sum(axis=1)
+
+
 def part1(data):
-    total = 0
-    for line in data.split("\n"):
-        # print(line)
-        winning_nums, your_nums = line.split(": ")[-1].split("|")
-        winning_nums = {int(n.strip()) for n in winning_nums.strip().split(" ") if n.strip()}
-        # print("  ", winning_nums)
-        your_nums = {int(n.strip()) for n in your_nums.strip().split(" ") if n.strip()}
-        # print("  ", your_nums)
-        overlap = len(winning_nums.intersection(your_nums))
-        # print("  ", overlap)
-        score = pow(2, overlap)
-        if score == 1:
-            score = 0
-        else:
-            score = score // 2
-        # print("  ", score)
-        total += score
+    matches = card_matches(data)
+    # 0 matches score nothing, then 1, 2, 4, ...
+    total = int(((1 << matches) >> 1).sum())
     print("Total:", total)
 
 
@@ -60,16 +68,8 @@ class Card:
     score: int
 
 
-def parse(line: str) -> Card:
-    card_str, numbers_str = line.split(": ")
-    *_, n_str = card_str.split(" ")
-    card_number = int(n_str.strip())
-    winning_nums, your_nums = numbers_str.split("|")
-    winning_nums = {int(n.strip()) for n in winning_nums.strip().split(" ") if n.strip()}
-    your_nums = {int(n.strip()) for n in your_nums.strip().split(" ") if n.strip()}
-    overlap = len(winning_nums.intersection(your_nums))
-    score = overlap
-    return Card(card_number, score)
+def parse(data: str) -> list[Card]:
+    return [Card(i, score) for i, score in enumerate(card_matches(data).tolist(), start=1)]
 
 
 def calculate_new_cards(card: Card, cards: list[Card]) -> int:
@@ -84,7 +84,7 @@ def calculate_new_cards(card: Card, cards: list[Card]) -> int:
 def part2(data):
     total = 0
 
-    cards = [parse(line) for line in data.split("\n")]
+    cards = parse(data)
 
     for card in cards:
         # print(card)
@@ -94,10 +94,16 @@ def part2(data):
     print("Total:", total)
 
 
-part1(DATA)
-part1(INPUT)
-part2(DATA2)
-part2(INPUT)
-total_elapsed = time.perf_counter() - start_time
-print(f" read: {read_time*1000:.4f} ms")
-print(f"total: {total_elapsed*1000:.4f} ms")
+if __name__ == "__main__":
+    timing.enable()
+    with timing.phase("read"):
+        INPUT = read_input()
+    with timing.phase("part1 example"):
+        part1(DATA)
+    with timing.phase("part1"):
+        part1(INPUT)
+    with timing.phase("part2 example"):
+        part2(DATA2)
+    with timing.phase("part2"):
+        part2(INPUT)
+    print(timing.summary())
@@ -1,9 +1,15 @@
 import sys
-import time
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc import timing  # noqa: E402
+from aoc.ints import integers  # noqa: E402
+
 
 def read_input():
     input_file = Path(__file__).absolute().parent / "input"
@@ -11,12 +17,6 @@ def read_input():
     return data
 
 
-start_time = time.perf_counter()
-INPUT = read_input()
-read_time = time.perf_counter() - start_time
-print(f" read: {read_time*1000:.4f} ms")
-
-
 DATA = """\
 seeds: 79 14 55 13
 
@@ -63,18 +63,14 @@ class Range:
 
 class Map:
     def __init__(self, section: str) -> None:
-        lines = section.strip().split("\n")
-        title, *ranges = lines
+        title, ranges = section.strip().split("\n", 1)
         self.src, self.dst = title.strip().split(" map")[0].split("-to-")
         # print(self.src, "->", self.dst)
 
-        self.ranges: list[Range] = []
-        for line in ranges:
-            as_nums = [int(x) for x in line.strip().split(" ")]
-            ds, ss, rl = as_nums
-            self.ranges.append(
-                Range(dst_start=ds, src_start=ss, range_len=rl)
-            )
+        self.ranges: list[Range] = [
+            Range(dst_start=ds, src_start=ss, range_len=rl)
+            for ds, ss, rl in integers(ranges).reshape(-1, 3).tolist()
+        ]
         # for r in self.ranges:
         #     print("  ", r)
 
@@ -96,7 +92,7 @@ def part1(data):
     lowest_location = sys.maxsize
 
     sections = data.strip().split("\n\n")
-    seeds = [int(x) for x in sections[0].strip().split(": ")[-1].split(" ")]
+    seeds = integers(sections[0]).tolist()
     # print(seeds)
 
     maps = [Map(m) for m in sections[1:]]
@@ -132,7 +128,7 @@ def part2_1(data):
     lowest_location = sys.maxsize
 
     sections = data.strip().split("\n\n")
-    seeds = [int(x) for x in sections[0].strip().split(": ")[-1].split(" ")]
+    seeds = integers(sections[0]).tolist()
     print(seeds)
 
     global g_maps
@@ -186,7 +182,7 @@ def part2_2(data):
     # lowest_location = sys.maxsize
 
     sections = data.strip().split("\n\n")
-    seeds = [int(x) for x in sections[0].strip().split(": ")[-1].split(" ")]
+    seeds = integers(sections[0]).tolist()
     print(seeds)
 
     global g_maps
@@ -264,6 +260,7 @@ def f(seed: int) -> int:
 breakpoints: set[int] = set()
 
 
+@timing.timed()
 def get_breakpoints() -> set[int]:
     result = set()
     for m in maps:
@@ -309,6 +306,7 @@ def break_all(r: R) -> list[R]:
         return break_all(r1) + break_all(r2)
 
 
+@timing.timed()
 def join_all(rs: list[R]) -> list[R]:
     new_rs = []
     cr = rs[0]
@@ -327,7 +325,7 @@ def break_ranges(data):
     lowest = sys.maxsize
 
     sections = data.strip().split("\n\n")
-    seeds = [int(x) for x in sections[0].strip().split(": ")[-1].split(" ")]
+    seeds = integers(sections[0]).tolist()
     global maps
     maps = [Map(m) for m in sections[1:]]
     global breakpoints
@@ -372,7 +370,7 @@ def part2_3(data):
     lowest = sys.maxsize
 
     sections = data.strip().split("\n\n")
-    seeds = [int(x) for x in sections[0].strip().split(": ")[-1].split(" ")]
+    seeds = integers(sections[0]).tolist()
     global maps
     maps = [Map(m) for m in sections[1:]]
     global breakpoints
@@ -410,10 +408,20 @@ def part2_3(data):
     print(lowest)
 
 
-part1(DATA)
-part1(INPUT)
-part2_3(DATA2)
-part2_3(INPUT)
-total_time = time.perf_counter() - start_time
-print(f"total: {total_time*1000:.4f} ms")
+part2 = part2_3
+
+
+if __name__ == "__main__":
+    timing.enable()
+    with timing.phase("read"):
+        INPUT = read_input()
+    with timing.phase("part1 example"):
+        part1(DATA)
+    with timing.phase("part1"):
+        part1(INPUT)
+    with timing.phase("part2 example"):
+        part2(DATA2)
+    with timing.phase("part2"):
+        part2(INPUT)
+    print(timing.summary())
 
@@ -1,9 +1,16 @@
-import time
 import dataclasses
 import functools
+import sys
 from operator import mul
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc import timing  # noqa: E402
+from aoc.ints import integers  # noqa: E402
+
 
 def read_input():
     input_file = Path(__file__).absolute().parent / "input"
@@ -11,10 +18,6 @@ def read_input():
     return data
 
 
-start_time = time.perf_counter()
-INPUT = read_input()
-
-
 DATA = """\
 Time:      7  15   30
 Distance:  9  40  200\
@@ -27,15 +30,17 @@ class Race:
     distance: int
 
 
+@timing.timed()
 def parse(data) -> list[Race]:
     time_line, distance_line = data.strip().split("\n")
-    times = [int(x) for x in time_line.strip().split(":")[-1].strip().split()]
-    distances = [int(x) for x in distance_line.strip().split(":")[-1].strip().split()]
+    times = integers(time_line).tolist()
+    distances = integers(distance_line).tolist()
     print(times)
     print(distances)
     return [Race(x, y) for x, y in zip(times, distances)]
 
 
+@timing.timed()
 def ways_to_win(race: Race) -> int:
     ways = 0
 
@@ -62,22 +67,24 @@ Time:      71530
 Distance:  940200\
 """
 
-input_file2 = Path(__file__).absolute().parent / "input2"
-INPUT2 = input_file2.read_text().strip()
-read_time = time.perf_counter()
 
 def part2(data):
-    race = parse(data)[0]
+    # the spaces between numbers are bad kerning, there is only one race
+    race = parse(data.replace(" ", ""))[0]
     result = ways_to_win(race)
     print(result)
 
 
-part1(DATA)
-part1(INPUT)
-part2(DATA2)
-part2(INPUT2)
-end_time = time.perf_counter()
-read_elapsed = read_time - start_time
-print(f" read: {read_elapsed*1000:.4f} ms")
-total_elapsed = end_time - start_time
-print(f"total: {total_elapsed*1000:.4f} ms")
+if __name__ == "__main__":
+    timing.enable()
+    with timing.phase("read"):
+        INPUT = read_input()
+    with timing.phase("part1 example"):
+        part1(DATA)
+    with timing.phase("part1"):
+        part1(INPUT)
+    with timing.phase("part2 example"):
+        part2(DATA2)
+    with timing.phase("part2"):
+        part2(INPUT)
+    print(timing.summary())
@@ -3,7 +3,10 @@ from pathlib import Path
 from collections import Counter
 
 
-INPUT = (Path(__file__).absolute().parent / "input").read_text().strip()
+def read_input():
+    input_file = Path(__file__).absolute().parent / "input"
+    data = input_file.read_text().strip()
+    return data
 
 
 DATA = """\
@@ -161,8 +164,10 @@ def part2(data):
     print("Winnings:", winnings)
 
 
-part1(DATA)   # 6440
-# part1(INPUT)
-part2(DATA2)  # 5905
-# part2(INPUT)  # 248439515 is too low
-              # 248439515
+if __name__ == "__main__":
+    INPUT = read_input()
+    part1(DATA)   # 6440
+    # part1(INPUT)
+    part2(DATA2)  # 5905
+    # part2(INPUT)  # 248439515 is too low
+    #               # 248439515
@@ -4,7 +4,10 @@ import sys
 from pathlib import Path
 
 
-INPUT = (Path(__file__).absolute().parent / "input").read_text().strip()
+def read_input():
+    input_file = Path(__file__).absolute().parent / "input"
+    data = input_file.read_text().strip()
+    return data
 
 
 DATA = """\
@@ -186,10 +189,12 @@ def experiment(data):
     print(math.lcm(*acc))
 
 
-# part1(DATA)
-# part1(DATA2)
-# part1(INPUT)
-# part2(DATA3)
-# part2(INPUT)  # probably won't complete in my lifetime :(
-experiment(DATA3)
-experiment(INPUT)
+if __name__ == "__main__":
+    INPUT = read_input()
+    # part1(DATA)
+    # part1(DATA2)
+    # part1(INPUT)
+    # part2(DATA3)
+    # part2(INPUT)  # probably won't complete in my lifetime :(
+    experiment(DATA3)
+    experiment(INPUT)
@@ -1,8 +1,18 @@
 import dataclasses
+import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
 
-INPUT = (Path(__file__).absolute().parent / "input").read_text().strip()
+from aoc.ints import integers_by_line, split  # noqa: E402
+
+
+def read_input():
+    input_file = Path(__file__).absolute().parent / "input"
+    data = input_file.read_text().strip()
+    return data
 
 
 DATA = """\
@@ -13,13 +23,7 @@ DATA = """\
 
 
 def parse(data) -> list[list[int]]:
-    result = []
-    lines = data.strip().split("\n")
-    for line in lines:
-        result.append(
-            [int(x) for x in line.strip().split()]
-        )
-    return result
+    return [line.tolist() for line in split(*integers_by_line(data.strip()))]
 
 
 def part1_solve(readings: list[int]) -> int:
@@ -109,7 +113,9 @@ def part2(data):
     print("Total:", total)
 
 
-part1(DATA)
-part1(INPUT)
-part2(DATA)
-part2(INPUT)
+if __name__ == "__main__":
+    INPUT = read_input()
+    part1(DATA)
+    part1(INPUT)
+    part2(DATA)
+    part2(INPUT)
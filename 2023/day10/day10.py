@@ -1,9 +1,17 @@
 import dataclasses
-import queue
-from queue import Queue
+import sys
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from aoc import timing  # noqa: E402
+from aoc.grid import Grid as CharGrid  # noqa: E402
 
 
 @dataclasses.dataclass
@@ -25,7 +33,12 @@ class DirLoc:
         return cls(loc.x, loc.y, loc.type, conn)
 
 
-INPUT = (Path(__file__).absolute().parent / "input").read_text().strip()
+def read_input():
+    input_file = Path(__file__).absolute().parent / "input"
+    data = input_file.read_text().strip()
+    return data
+
+
 DATA = """\
 .....
 .S-7.
@@ -42,11 +55,6 @@ LJ...\
 """
 
 
-def split_and_strip(data: str, sep: str) -> list[str]:
-    parts = data.strip().split(sep)
-    return [p.strip() for p in parts]
-
-
 class Dir(Enum):
     UP = 0
     RIGHT = 1
@@ -56,30 +64,24 @@ class Dir(Enum):
 
 class Grid:
     def __init__(self, data: str):
-        self._g: list[str] = split_and_strip(data, "\n")
+        self._g = CharGrid.parse(data)
 
     def get(self, x, y) -> Optional[Loc]:
-        try:
-            return Loc(x, y, self._g[y][x])
-        except IndexError:
+        char = self._g.get(x, y)
+        if char is None:
             return None
+        return Loc(x, y, char)
 
     def find_s(self) -> Loc:
-        for y, row in enumerate(self.rows()):
-            for x, char in enumerate(row):
-                if char == "S":
-                    return Loc(x, y, "S")
-        raise ValueError("No S location found")
+        x, y = self._g.find("S")
+        return Loc(x, y, "S")
 
     def rows(self):
-        yield from self._g
+        yield from self._g.rows()
 
     def print_neighborhood(self, loc: Loc):
         print(f"neighborhood of {loc.type} at {loc.x},{loc.y}")
-        for y in range(loc.y-1, loc.y+2):
-            for x in range(loc.x-1, loc.x+2):
-                print(self._g[y][x], end="")
-            print()
+        print(self._g[loc.y-1:loc.y+2, loc.x-1:loc.x+2])
 
     def find_second_conn(self, dl: DirLoc) -> DirLoc:
         f = dl.conn
@@ -242,85 +244,23 @@ class Grid2(Grid):
         # print(out)
         # (Path(__file__).absolute().parent / "debug").write_text(out)
 
-    def flood_fill(self):
-        # do a flood fill from 0,0 corner along edges
-        def f(x, y):
-            if x <= len(self._g[0]):
-                q.put((x, y, x+1, y))
-            if x > 0:
-                q.put((x, y, x-1, y))
-            if y <= len(self._g):
-                q.put((x, y, x, y+1))
-            if y > 0:
-                q.put((x, y, x, y-1))
-
-        c = (0, 0)
-        q = queue.SimpleQueue()
-        visited: set[tuple[int, int, int, int]] = set()
-        corners: set[tuple[int, int]] = set()
-        f(*c)
-        while True:
-            try:
-                edge = q.get_nowait()
-                # print(edge)
-            except queue.Empty:
-                break
-            if edge in visited:
-                continue
-            x1, y1, x2, y2 = edge
-            visited.add((x1, y1, x2, y2))
-            visited.add((x2, y2, x1, y1))
-
-            # does edge cross a pipe edge?
-            """
-            ._._._.
-            | | | |
-            ._._._.
-            | | | |
-            ._._._.
-            """
-            horizontal = y1 == y2
-            if horizontal:
-                sx, sy = min(x1, x2), y1-1
-                ex, ey = min(x1, x2), y1
-            else:
-                assert x1 == x2
-                sx, sy = x1-1, min(y1, y2)
-                ex, ey = x1, min(y1, y2)
-            if (sx, sy, ex, ey) in self._conn:
-                # would cross a pipe, discard
-                # print("discard")
-                continue
-            # else:
-            #     print((sx, sy, ex, ey), "not in conn")
-
-            corners.add((x1, y1))
-            corners.add((x2, y2))
-            f(x2, y2)
-
-        # debug print flood fill
-        # out = ""
-        inside_count = 0
-        for y, row in enumerate(self.rows()):
-            for x, char in enumerate(row):
-                if (
-                    (x, y) in corners and
-                    (x+1, y) in corners and
-                    (x, y+1) in corners and
-                    (x+1, y+1) in corners
-                ):
-                    # out += "."
-                    continue
-                elif (x, y) in self._visited:
-                    # out += self.get(x, y).type
-                    continue
-                else:
-                    # out += "I"
-                    inside_count += 1
-            # out += "\n"
-        # print(out)
-        # (Path(__file__).absolute().parent / "debug").write_text(out)
-        print("Inside count:", inside_count)
+    @timing.timed()
+    def inside_count(self) -> int:
+        """Tiles enclosed by the loop, found by crossing each row from the left.
+
+        Every loop pipe that connects upwards (``|``, ``L`` and ``J``) flips
+        between outside and inside. ``-`` runs along the row and of the
+        ``F``/``7`` corner pair only one half connects up, so they don't.
+
+        """
+        loop = np.zeros(self._g.shape, dtype=bool)
+        xs, ys = zip(*self._visited)
+        loop[list(ys), list(xs)] = True
+        up = loop & self._g.mask("|LJ")
+        s = self.s
+        up[s.y, s.x] = self.is_conn(s, Loc(s.x, s.y - 1, ""))
+        inside = (np.cumsum(up, axis=1) % 2 == 1) & ~loop
+        return int(inside.sum())
 
 
 def part2(data):
@@ -342,17 +282,21 @@ def part2(data):
 
     # grid.debug_print()
 
-    # do a flood fill from 0,0 corner along edges
-    grid.flood_fill()
-
-
-import time
-start_time = time.perf_counter()
-part1(DATA)
-part1(DATA2)
-part1(INPUT)
-part2(DATA2_1)
-part2(INPUT)
-total_time = time.perf_counter() - start_time
-print(f"total: {total_time*1000:.4f} ms")
-
+    print("Inside count:", grid.inside_count())
+
+
+if __name__ == "__main__":
+    timing.enable()
+    with timing.phase("read"):
+        INPUT = read_input()
+    with timing.phase("part1 example"):
+        part1(DATA)
+    with timing.phase("part1 example 2"):
+        part1(DATA2)
+    with timing.phase("part1"):
+        part1(INPUT)
+    with timing.phase("part2 example"):
+        part2(DATA2_1)
+    with timing.phase("part2"):
+        part2(INPUT)
+    print(timing.summary())
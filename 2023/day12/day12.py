@@ -14,7 +14,10 @@ def split_and_strip(data: str, sep: str) -> list[str]:
     return [p.strip() for p in parts]
 
 
-INPUT = (Path(__file__).absolute().parent / "input").read_text().strip()
+def read_input():
+    input_file = Path(__file__).absolute().parent / "input"
+    data = input_file.read_text().strip()
+    return data
 
 
 DATA = """\
@@ -487,8 +490,10 @@ def part2(data):
     # p2()
 
 
-# part1(NO_UNKNOWNS)
-# part1(DATA)
-# part1(INPUT)
-part2(DATA)
-# part2(INPUT)
+if __name__ == "__main__":
+    # INPUT = read_input()
+    # part1(NO_UNKNOWNS)
+    # part1(DATA)
+    # part1(INPUT)
+    part2(DATA)
+    # part2(INPUT)
@@ -8,7 +8,6 @@ from typing import Literal, Optional
 from pathlib import Path
 
 
-logging.basicConfig(level=logging.WARNING, format="{message}", style='{')
 logger = logging.getLogger()
 
 
@@ -17,7 +16,10 @@ def split_and_strip(data: str, sep: str) -> list[str]:
     return [p.strip() for p in parts]
 
 
-INPUT = (Path(__file__).absolute().parent / "input").read_text().strip()
+def read_input():
+    input_file = Path(__file__).absolute().parent / "input"
+    data = input_file.read_text().strip()
+    return data
 
 DATA = """\
 ???.### 1,1,3
@@ -682,6 +684,8 @@ def part2(data):
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="{message}", style='{')
+    INPUT = read_input()
     # part2(DATA)
     part2(INPUT)
 
@@ -1,19 +1,53 @@
+"""Start a new day from template/, e.g. ``python 2023/new_day.py 13``.
+
+Besides the module and an empty input, this registers a placeholder input
+generator in aoc/generators/y2023.py, so the day can be benchmarked against
+inputs of any size once the generator writes its real format.
+
+"""
+import re
 import shutil
 import sys
 from pathlib import Path
 
+YEAR = 2023
+ROOT = Path(__file__).resolve().parents[1]
+GENERATORS = ROOT / "aoc" / "generators" / f"y{YEAR}.py"
+
+GENERATOR_STUB = '''
+
+@generator({year}, {day})
+def day{day:02}(size: int, rng: random.Random) -> str:
+    """Placeholder, ``size`` lines of numbers until this writes the day's format."""
+    return "\\n".join(str(rng.randint(0, 100)) for _ in range(size))
+'''
+
+
+def add_generator(day: int, path: Path = GENERATORS) -> bool:
+    source = path.read_text()
+    if re.search(rf"^@generator\({YEAR}, {day}\)$", source, re.MULTILINE):
+        return False
+    path.write_text(source.rstrip("\n") + "\n" + GENERATOR_STUB.format(year=YEAR, day=day))
+    return True
+
 
 def main():
-    day = sys.argv[1]
+    day = int(sys.argv[1])
     dir_ = Path(__file__).resolve().parent
     src = dir_ / "template"
-    dst = dir_ / f"day{day:0>2}"
+    dst = dir_ / f"day{day:02}"
     dst.mkdir()
     shutil.copyfile(
         (src / "day__.py"),
-        (dst / f"day{day:0>2}.py"),
+        (dst / f"day{day:02}.py"),
     )
     (dst / "input").touch()
+    if add_generator(day):
+        print(f"added a placeholder generator to {GENERATORS.relative_to(ROOT)}")
+
+    print(f"created {dst.relative_to(ROOT)}")
+    print(f"    python -m aoc {YEAR}/{day} --trace trace.json")
+    print(f"    python -m aoc.bench {YEAR}/{day} --sizes 100,1000,10000")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,17 @@
-import dataclasses
+import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
 
-INPUT = (Path(__file__).absolute().parent / "input").read_text().strip()
+from aoc import timing  # noqa: E402
+
+
+def read_input():
+    input_file = Path(__file__).absolute().parent / "input"
+    data = input_file.read_text().strip()
+    return data
 
 
 DATA = """\
@@ -10,15 +19,34 @@ DATA = """\
 """
 
 
-def part1(data):
+@timing.timed()
+def parse(data: str):
+    return data.strip().split("\n")
+
+
+def part1(parsed):
     ...
 
 
-def part2(data):
+def part2(parsed):
     ...
 
 
-part1(DATA)
-# part1(INPUT)
-# part2(DATA)
-# part2(INPUT)
+# python -m aoc and python -m aoc.bench parse the input with this and time it
+# apart from the parts
+PARSER = parse
+
+
+if __name__ == "__main__":
+    timing.enable()
+    with timing.phase("read"):
+        INPUT = read_input()
+    with timing.phase("part1 example"):
+        print(part1(parse(DATA)))
+    # with timing.phase("part1"):
+    #     print(part1(parse(INPUT)))
+    # with timing.phase("part2 example"):
+    #     print(part2(parse(DATA)))
+    # with timing.phase("part2"):
+    #     print(part2(parse(INPUT)))
+    print(timing.summary())
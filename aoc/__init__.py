@@ -0,0 +1,9 @@
+"""Shared tooling for running and measuring the Advent of Code solutions.
+
+Solutions live in ``<year>/dayNN/`` directories and stay runnable as plain
+scripts. This package finds them, imports them on demand and runs their
+``part1``/``part2`` functions against the ``input`` file next to them.
+
+    python -m aoc 2020/8 2023
+
+"""
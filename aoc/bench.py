@@ -0,0 +1,314 @@
+"""Benchmark the solutions, the whole catalog generalization of 2020/day01/bench.py.
+
+Every part is run ``--warmup`` times untimed and then ``--repeat`` times with
+the read, parse and solve phases timed separately. For the 2022 days that
+read their own input, reading and parsing are part of the solve time.
+
+With ``--sizes`` the parts run on generated inputs of each size instead (see
+``aoc.generators``), and the growth exponent between the smallest and largest
+size is reported, ``1.0`` is linear and ``2.0`` quadratic.
+
+    python -m aoc.bench 2020 --repeat 10 --json bench.json
+    python -m aoc.bench --baseline bench.json --threshold 0.2
+    python -m aoc.bench 2023/11 --sizes 50,100,200,400 --seed 1
+
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from aoc.generators import GENERATORS, generate
+from aoc.registry import PARTS, Solver
+from aoc.runner import (
+    MissingInputError, answer_from, call_quietly, prepare_args, read_input, select, takes_input,
+)
+
+
+PHASES = ("read", "parse", "solve", "total")
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """Nearest-rank percentile, ``p`` is between 0 and 100."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 95),
+        "runs": len(samples),
+    }
+
+
+@dataclass
+class Timing:
+    key: str
+    part: str
+    size: Optional[int] = None
+    answer: Optional[str] = None
+    error: Optional[str] = None
+    samples: dict[str, list[float]] = field(default_factory=lambda: {p: [] for p in PHASES})
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {phase: summarize(s) for phase, s in self.samples.items() if s}
+
+    @property
+    def name(self) -> str:
+        """Generated inputs are recorded as e.g. ``2020/day07@1000``."""
+        return self.key if self.size is None else f"{self.key}@{self.size}"
+
+    def as_dict(self) -> dict:
+        d = {"answer": self.answer, "error": self.error}
+        d.update(self.stats())
+        return d
+
+
+def time_once(
+    solver: Solver, part: str, data: Optional[str] = None,
+) -> tuple[dict[str, float], object]:
+    func = solver.part(part)
+    t0 = time.perf_counter()
+    if data is None:
+        data = read_input(solver)
+    t1 = time.perf_counter()
+    args = prepare_args(solver, func, data)
+    t2 = time.perf_counter()
+    answer, output = call_quietly(func, args)
+    t3 = time.perf_counter()
+    phases = {"read": t1 - t0, "parse": t2 - t1, "solve": t3 - t2, "total": t3 - t0}
+    return phases, answer_from(answer, output)
+
+
+def bench_part(
+    solver: Solver, part: str, repeat: int = 5, warmup: int = 1, data: Optional[str] = None,
+    size: Optional[int] = None,
+) -> Timing:
+    timing = Timing(solver.key, part, size=size)
+    try:
+        for _ in range(warmup):
+            time_once(solver, part, data)
+        for _ in range(repeat):
+            phases, answer = time_once(solver, part, data)
+            for phase, elapsed in phases.items():
+                timing.samples[phase].append(elapsed)
+        timing.answer = str(answer)
+    except MissingInputError as err:
+        timing.error = str(err)
+    except Exception as err:
+        timing.error = f"{err.__class__.__name__}: {err}"
+    return timing
+
+
+def bench(
+    solvers: Iterable[Solver],
+    parts: Iterable[str] = PARTS,
+    repeat: int = 5,
+    warmup: int = 1,
+) -> Iterator[Timing]:
+    parts = tuple(parts)
+    for solver in solvers:
+        for part in parts:
+            if part in solver.parts:
+                yield bench_part(solver, part, repeat=repeat, warmup=warmup)
+
+
+def sweep(
+    solvers: Iterable[Solver],
+    sizes: list[int],
+    parts: Iterable[str] = PARTS,
+    repeat: int = 5,
+    warmup: int = 1,
+    seed: int = 0,
+) -> Iterator[Timing]:
+    """Time every part on generated inputs of each size."""
+    parts = tuple(parts)
+    for solver in solvers:
+        if (solver.year, solver.day) not in GENERATORS:
+            continue
+        for part in parts:
+            if part not in solver.parts or not takes_input(solver.part(part)):
+                continue
+            for size in sizes:
+                data = generate(solver.year, solver.day, size, seed)
+                yield bench_part(solver, part, repeat=repeat, warmup=warmup, data=data, size=size)
+
+
+def growth_exponent(points: list[tuple[int, float]]) -> Optional[float]:
+    """Slope of time against size on a log-log scale, between the first and last point."""
+    points = [(n, t) for n, t in sorted(points) if n > 0 and t > 0]
+    if len(points) < 2 or points[0][0] == points[-1][0]:
+        return None
+    (n0, t0), (n1, t1) = points[0], points[-1]
+    return math.log(t1 / t0) / math.log(n1 / n0)
+
+
+def curves(timings: list[Timing]) -> dict[str, dict]:
+    """The size sweep of each part, and how fast it grows."""
+    points: dict[tuple[str, str], list[tuple[int, float]]] = {}
+    for timing in timings:
+        if timing.size is None or timing.error is not None:
+            continue
+        median = timing.stats()["total"]["median"]
+        points.setdefault((timing.key, timing.part), []).append((timing.size, median))
+    result: dict[str, dict] = {}
+    for (key, part), p in points.items():
+        result.setdefault(key, {})[part] = {
+            "points": [[n, t] for n, t in sorted(p)],
+            "exponent": growth_exponent(p),
+        }
+    return result
+
+
+def report(timings: list[Timing], repeat: int, warmup: int, seed: Optional[int] = None) -> dict:
+    results: dict[str, dict] = {}
+    for timing in timings:
+        results.setdefault(timing.name, {})[timing.part] = timing.as_dict()
+    d = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "results": results,
+    }
+    if any(t.size is not None for t in timings):
+        d["seed"] = seed
+        d["curves"] = curves(timings)
+    return d
+
+
+@dataclass
+class Regression:
+    key: str
+    part: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+    def __str__(self):
+        return (
+            f"{self.key} {self.part}: {self.baseline*1000:.3f} ms -> "
+            f"{self.current*1000:.3f} ms ({self.ratio:.2f}x)"
+        )
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = 0.1, min_delta: float = 0.001,
+) -> list[Regression]:
+    """Parts whose median total time got slower than the threshold allows.
+
+    ``min_delta`` (seconds) keeps sub-millisecond parts from failing on noise.
+
+    """
+    regressions = []
+    for key, parts in current["results"].items():
+        for part, stats in parts.items():
+            try:
+                before = baseline["results"][key][part]["total"]["median"]
+                after = stats["total"]["median"]
+            except KeyError:
+                continue
+            if after > before * (1 + threshold) and after - before > min_delta:
+                regressions.append(Regression(key, part, before, after))
+    return regressions
+
+
+def test_percentile():
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(samples, 50) == 3.0
+    assert percentile(samples, 95) == 5.0
+    assert percentile(samples, 0) == 1.0
+
+
+def test_growth_exponent():
+    assert growth_exponent([(10, 1.0), (100, 10.0)]) == 1.0
+    assert growth_exponent([(100, 4.0), (10, 0.04), (50, 1.0)]) == 2.0
+    assert growth_exponent([(10, 1.0)]) is None
+
+
+def test_compare():
+    def r(median):
+        return {"results": {"2020/day01": {"part1": {"total": {"median": median}}}}}
+
+    assert compare(r(0.100), r(0.105), threshold=0.1) == []
+    assert compare(r(0.100), r(0.200), threshold=0.1)[0].ratio == 2.0
+    # too small to be more than noise
+    assert compare(r(0.0001), r(0.0005), threshold=0.1) == []
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc.bench", description="Benchmark solutions")
+    parser.add_argument("targets", nargs="*", help="year, year/day or year/dayNN (default: all)")
+    parser.add_argument("-p", "--part", type=int, choices=(1, 2), help="only run this part")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="timed runs per part")
+    parser.add_argument("-w", "--warmup", type=int, default=1, help="untimed runs per part")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against a saved --json file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="allowed slowdown of the median total time before failing (0.1 = 10%%)")
+    parser.add_argument(
+        "--sizes", type=lambda s: [int(n) for n in s.split(",")],
+        help="comma separated sizes of generated input to run instead of the input files")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated inputs")
+    args = parser.parse_args(argv)
+
+    solvers = select(args.targets)
+    if not solvers:
+        print("No solutions found", file=sys.stderr)
+        return 1
+    parts = (f"part{args.part}",) if args.part else PARTS
+
+    if args.sizes:
+        timings_iter = sweep(
+            solvers, args.sizes, parts, repeat=args.repeat, warmup=args.warmup, seed=args.seed)
+    else:
+        timings_iter = bench(solvers, parts, repeat=args.repeat, warmup=args.warmup)
+
+    timings = []
+    for timing in timings_iter:
+        timings.append(timing)
+        if timing.error is not None:
+            print(f"{timing.name} {timing.part}: {timing.error}")
+            continue
+        stats = timing.stats()
+        print(
+            f"{timing.name} {timing.part}: "
+            + "  ".join(f"{p} {stats[p]['median']*1000:.3f}" for p in ("parse", "solve"))
+            + f"  total min {stats['total']['min']*1000:.3f}"
+            + f" median {stats['total']['median']*1000:.3f}"
+            + f" p95 {stats['total']['p95']*1000:.3f} ms"
+        )
+
+    result = report(timings, args.repeat, args.warmup, seed=args.seed)
+    for key, parts_ in result.get("curves", {}).items():
+        for part, curve in parts_.items():
+            if curve["exponent"] is not None:
+                print(f"{key} {part}: grows like n^{curve['exponent']:.2f}")
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(baseline, result, threshold=args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""On-disk cache of answers, so unchanged days on unchanged input aren't solved again.
+
+An entry is addressed by a hash of the input bytes and of the source of the
+solution module, together with every module of this repository it imports.
+Editing any of them or the input changes the address, so stale entries are
+never read back, they just stop being used and age out. Modules from outside
+the repository (the standard library, NumPy) are not part of the hash.
+
+Every entry is a small JSON file. Hits refresh the file's modification time
+and once the directory is over ``max_bytes`` the least recently used entries
+are deleted.
+
+"""
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from aoc.registry import ROOT, Solver
+
+
+DEFAULT_DIR = ROOT / ".aoc-cache"
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+
+def local_imports(path: Path, root: Path = ROOT) -> list[Path]:
+    """Files of this repository that a module imports, looked up next to it and from the root."""
+    tree = ast.parse(path.read_text(), filename=str(path))
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            # ``from aoc import timing`` imports the submodule aoc/timing.py
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+
+    found = []
+    for name in names:
+        relative = Path(*name.split("."))
+        candidates = [
+            candidate
+            for base in (path.parent, root)
+            for candidate in (base / relative.with_suffix(".py"), base / relative / "__init__.py")
+            if candidate.is_file()
+        ]
+        if candidates:
+            # the script's own directory comes first on sys.path
+            found.append(candidates[0].resolve())
+    return found
+
+
+def source_hash(path: Path, root: Path = ROOT) -> str:
+    """Hash of a module's source and the source of everything local it imports."""
+    digest = hashlib.sha256()
+    seen = set()
+    pending = [path.resolve()]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        pending.extend(local_imports(current, root))
+    for current in sorted(seen):
+        name = current.relative_to(root) if current.is_relative_to(root) else current
+        digest.update(f"{name}\0".encode())
+        digest.update(current.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _jsonable(answer: Any) -> Any:
+    if answer is None or isinstance(answer, (bool, int, float, str)):
+        return answer
+    return str(answer)
+
+
+class Cache:
+    def __init__(self, directory: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._source_hashes: dict[Path, str] = {}
+
+    def key(self, solver: Solver, part: str, data: Optional[str]) -> str:
+        if solver.path not in self._source_hashes:
+            self._source_hashes[solver.path] = source_hash(solver.path)
+        digest = hashlib.sha256()
+        digest.update(f"{solver.key} {part}\0".encode())
+        digest.update(self._source_hashes[solver.path].encode())
+        digest.update(b"\0")
+        if data is not None:
+            digest.update(hashlib.sha256(data.encode()).digest())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key[2:]}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, answer: Any, output: str = "", elapsed: float = 0.0) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"answer": _jsonable(answer), "output": output, "elapsed": elapsed}
+        # write then rename, so a reader never sees half an entry
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)
+        self.prune()
+
+    def prune(self) -> None:
+        """Delete the least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def test_source_hash_follows_imports(tmp_path):
+    (tmp_path / "helper.py").write_text("X = 1\n")
+    (tmp_path / "day.py").write_text("import os\nfrom helper import X\n")
+    before = source_hash(tmp_path / "day.py", root=tmp_path)
+    helper = (tmp_path / "helper.py").resolve()
+    assert local_imports(tmp_path / "day.py", root=tmp_path) == [helper]
+    (tmp_path / "helper.py").write_text("X = 2\n")
+    assert source_hash(tmp_path / "day.py", root=tmp_path) != before
+
+
+def test_get_put_prune(tmp_path):
+    cache = Cache(tmp_path, max_bytes=10_000)
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, 42, "42\n", 0.5)
+    assert cache.get("ab" * 32) == {"answer": 42, "output": "42\n", "elapsed": 0.5}
+
+    cache.max_bytes = 0
+    cache.put("cd" * 32, [1, 2])
+    assert cache.get("ab" * 32) is None
@@ -0,0 +1,43 @@
+"""Seeded synthetic inputs of any size, for timing how the solutions scale.
+
+A generator takes the requested ``size`` and a ``random.Random`` and returns
+the puzzle text. What ``size`` counts depends on the format, it is the number
+of lines, records, rows or rules, whichever the day's work grows with.
+
+    python -m aoc.generators 2020/7 --size 1000 --seed 1 > rules.txt
+
+"""
+import random
+from typing import Callable, Optional
+
+Generator = Callable[[int, random.Random], str]
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+
+
+def generator(year: int, day: int) -> Callable[[Generator], Generator]:
+    def register(func: Generator) -> Generator:
+        GENERATORS[(year, day)] = func
+        return func
+    return register
+
+
+def generate(year: int, day: int, size: int, seed: Optional[int] = 0) -> str:
+    """Puzzle input for a day, the same seed and size always give the same text."""
+    try:
+        func = GENERATORS[(year, day)]
+    except KeyError:
+        raise KeyError(f"No generator for {year}/day{day:02}") from None
+    if size < 1:
+        raise ValueError(f"size must be positive, got {size}")
+    return func(size, random.Random(seed))
+
+
+def grid(width: int, height: int, rng: random.Random, chars: str = ".#",
+         weights: Optional[list[float]] = None) -> str:
+    rows = ["".join(rng.choices(chars, weights=weights, k=width)) for _ in range(height)]
+    return "\n".join(rows)
+
+
+# register the generators
+from aoc.generators import y2020, y2021, y2023  # noqa: E402,F401
@@ -0,0 +1,31 @@
+import argparse
+import sys
+
+from aoc.generators import GENERATORS, generate
+from aoc.runner import parse_target
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc.generators", description="Generate synthetic puzzle input")
+    parser.add_argument("target", nargs="?", help="year/day to generate input for")
+    parser.add_argument("-n", "--size", type=int, default=1000)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-l", "--list", action="store_true", help="list the days with generators")
+    args = parser.parse_args()
+
+    if args.list or args.target is None:
+        for year, day in sorted(GENERATORS):
+            print(f"{year}/day{day:02}")
+        return 0
+
+    year, day = parse_target(args.target)
+    if day is None:
+        parser.error("target must be a single day, e.g. 2020/7")
+    sys.stdout.write(generate(year, day, args.size, args.seed))
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+import itertools
+import random
+import string
+
+from aoc.generators import generator, grid
+
+
+@generator(2020, 1)
+def expense_report(size: int, rng: random.Random) -> str:
+    """``size`` entries with exactly one pair and one triple that sum to 2020.
+
+    The filler is all above 2020 so it can never be part of an answer, and the
+    search has to look at everything.
+
+    """
+    if size < 5:
+        raise ValueError("an expense report needs at least 5 entries")
+    while True:
+        a = rng.randint(600, 1009)
+        b, c = rng.randint(100, 900), rng.randint(100, 900)
+        planted = [a, 2020 - a, b, c, 2020 - b - c]
+        if len(set(planted)) < 5 or min(planted) < 1:
+            continue
+        pairs = [x for x in itertools.combinations(planted, 2) if sum(x) == 2020]
+        triples = [x for x in itertools.combinations(planted, 3) if sum(x) == 2020]
+        if len(pairs) == 1 and len(triples) == 1:
+            break
+    entries = planted + [rng.randint(2021, 1_000_000) for _ in range(size - 5)]
+    rng.shuffle(entries)
+    return "\n".join(str(e) for e in entries)
+
+
+@generator(2020, 2)
+def password_policies(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        length = rng.randint(1, 20)
+        low = rng.randint(1, length)
+        high = rng.randint(low, length)
+        letter = rng.choice(string.ascii_lowercase[:8])
+        password = "".join(rng.choices(string.ascii_lowercase[:8], k=length))
+        lines.append(f"{low}-{high} {letter}: {password}")
+    return "\n".join(lines)
+
+
+@generator(2020, 3)
+def tree_map(size: int, rng: random.Random) -> str:
+    """``size`` rows of the usual 31 wide map."""
+    return grid(31, size, rng, ".#", weights=[4, 1])
+
+
+def _passport_field(field: str, rng: random.Random) -> str:
+    valid = rng.random() < 0.9
+    if field == "byr":
+        value = str(rng.randint(1920, 2002) if valid else rng.randint(1900, 2020))
+    elif field == "iyr":
+        value = str(rng.randint(2010, 2020) if valid else rng.randint(2000, 2030))
+    elif field == "eyr":
+        value = str(rng.randint(2020, 2030) if valid else rng.randint(2010, 2040))
+    elif field == "hgt":
+        if rng.random() < 0.5:
+            value = f"{rng.randint(150, 193) if valid else rng.randint(100, 250)}cm"
+        else:
+            value = f"{rng.randint(59, 76) if valid else rng.randint(30, 99)}in"
+        if not valid and rng.random() < 0.3:
+            value = value[:-2]
+    elif field == "hcl":
+        chars = "0123456789abcdef" if valid else "0123456789abcdefz"
+        value = "#" + "".join(rng.choices(chars, k=6))
+    elif field == "ecl":
+        colors = ["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]
+        value = rng.choice(colors if valid else colors + ["zzz", "xry"])
+    elif field == "pid":
+        value = "".join(rng.choices(string.digits, k=9 if valid else rng.randint(7, 11)))
+    else:  # cid
+        value = str(rng.randint(10, 350))
+    return f"{field}:{value}"
+
+
+@generator(2020, 4)
+def passports(size: int, rng: random.Random) -> str:
+    """``size`` passports, some missing fields and some with invalid values."""
+    all_fields = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid", "cid"]
+    records = []
+    for _ in range(size):
+        fields = [f for f in all_fields if rng.random() < 0.95]
+        rng.shuffle(fields)
+        pairs = [_passport_field(f, rng) for f in fields]
+        text = ""
+        for i, pair in enumerate(pairs):
+            if i:
+                text += rng.choice(" \n")
+            text += pair
+        records.append(text)
+    return "\n\n".join(records)
+
+
+@generator(2020, 5)
+def boarding_passes(size: int, rng: random.Random) -> str:
+    """``size`` consecutive seats with one missing in the middle.
+
+    The plane only has 1024 seats, so this tops out at 1022 passes.
+
+    """
+    if not 2 <= size <= 1022:
+        raise ValueError("size must be between 2 and 1022 boarding passes")
+    start = rng.randint(1, 1023 - size)
+    seat_ids = list(range(start, start + size + 1))
+    seat_ids.remove(rng.choice(seat_ids[1:-1]))
+    rng.shuffle(seat_ids)
+    rows = str.maketrans("01", "FB")
+    cols = str.maketrans("01", "LR")
+    passes = []
+    for seat_id in seat_ids:
+        row, col = divmod(seat_id, 8)
+        passes.append(f"{row:07b}".translate(rows) + f"{col:03b}".translate(cols))
+    return "\n".join(passes)
+
+
+def test_boarding_passes_fill_the_plane():
+    bits = str.maketrans("FBLR", "0101")
+    for size in (2, 1022):
+        for seed in range(20):
+            text = boarding_passes(size, random.Random(seed))
+            ids = sorted(int(line.translate(bits), 2) for line in text.split("\n"))
+            assert len(ids) == size and 1 <= ids[0] and ids[-1] <= 1023
+            missing = [i + 1 for i, j in zip(ids, ids[1:]) if j == i + 2]
+            assert len(missing) == 1 and ids[-1] - ids[0] == size
+
+
+@generator(2020, 6)
+def customs_answers(size: int, rng: random.Random) -> str:
+    """``size`` groups of one to five people."""
+    groups = []
+    for _ in range(size):
+        people = []
+        for _ in range(rng.randint(1, 5)):
+            answers = rng.sample(string.ascii_lowercase, rng.randint(1, 26))
+            people.append("".join(answers))
+        groups.append("\n".join(people))
+    return "\n\n".join(groups)
+
+
+ADJECTIVES = [
+    "bright", "clear", "dark", "dim", "dotted", "drab", "dull", "faded", "light", "mirrored",
+    "muted", "pale", "plaid", "posh", "shiny", "striped", "vibrant", "wavy",
+]
+COLORS = [
+    "aqua", "beige", "black", "blue", "bronze", "brown", "chartreuse", "coral", "crimson",
+    "cyan", "fuchsia", "gold", "gray", "green", "indigo", "lavender", "lime", "magenta",
+    "maroon", "olive", "orange", "plum", "purple", "red", "salmon", "silver", "tan", "teal",
+    "tomato", "turquoise", "violet", "white", "yellow",
+]
+
+
+def bag_names(count: int) -> list[str]:
+    """``count`` unique two word bag names, numbering the adjectives once they run out."""
+    names = []
+    for n in itertools.count():
+        for adjective, color in itertools.product(ADJECTIVES, COLORS):
+            if len(names) == count:
+                return names
+            names.append(f"{adjective}{n or ''} {color}")
+
+
+@generator(2020, 7)
+def bag_rules(size: int, rng: random.Random, depth: int = 6, max_children: int = 4,
+              max_count: int = 5) -> str:
+    """``size`` rules in ``depth`` levels, each bag only holds bags from the next level.
+
+    "shiny gold" is on the second level, so it has parents and the number of
+    bags inside it depends on the depth rather than blowing up with the size.
+
+    """
+    if size < depth:
+        raise ValueError(f"need at least {depth} bag rules")
+    names = [n for n in bag_names(size + 1) if n != "shiny gold"][:size - 1]
+    rng.shuffle(names)
+    names.insert(0, "shiny gold")
+    levels = [names[i::depth] for i in range(depth)]
+    levels[0], levels[1] = levels[1], levels[0]
+
+    rules = []
+    for level, bags in enumerate(levels):
+        for i, name in enumerate(bags):
+            if level == depth - 1:
+                rules.append(f"{name} bags contain no other bags.")
+                continue
+            below = levels[level + 1]
+            children = rng.sample(below, min(len(below), rng.randint(1, max_children)))
+            if level == 0 and i == 0 and "shiny gold" not in children:
+                children.append("shiny gold")
+            parts = []
+            for child in children:
+                count = rng.randint(1, max_count)
+                parts.append(f"{count} {child} bag{'s' if count > 1 else ''}")
+            rules.append(f"{name} bags contain {', '.join(parts)}.")
+    rng.shuffle(rules)
+    return "\n".join(rules)
+
+
+@generator(2020, 8)
+def boot_code(size: int, rng: random.Random) -> str:
+    """``size`` instructions that loop forever unless one nop/jmp is flipped.
+
+    A terminating program of ``acc``, ``nop`` and forward ``jmp`` is built
+    first, then a ``nop -d`` on its path is turned into a ``jmp -d`` back over
+    a run of non-jumps, which closes the loop.
+
+    """
+    if size < 3:
+        raise ValueError("need at least 3 instructions")
+    while True:
+        program = []
+        for i in range(size):
+            kind = rng.choices(["acc", "nop", "jmp"], weights=[2, 1, 1])[0]
+            if kind == "jmp":
+                program.append(["jmp", rng.randint(1, min(5, size - i))])
+            else:
+                program.append([kind, rng.randint(-99, 99)])
+
+        path = []
+        i = 0
+        while i < size:
+            path.append(i)
+            i += program[i][1] if program[i][0] == "jmp" else 1
+
+        candidates = []
+        for i in path:
+            if i == 0 or program[i][0] != "nop":
+                continue
+            run = 0
+            while run < i and program[i - run - 1][0] != "jmp":
+                run += 1
+            if run:
+                candidates.append((i, run))
+        if candidates:
+            break
+
+    i, run = rng.choice(candidates)
+    program[i] = ["jmp", -rng.randint(1, run)]
+    return "\n".join(f"{op} {arg:+d}" for op, arg in program)
+
+
+@generator(2020, 22)
+def card_decks(size: int, rng: random.Random) -> str:
+    """Two decks of ``size`` cards each, dealt from 1 to ``2 * size``."""
+    cards = list(range(1, 2 * size + 1))
+    rng.shuffle(cards)
+    deck1 = "\n".join(str(c) for c in cards[:size])
+    deck2 = "\n".join(str(c) for c in cards[size:])
+    return f"Player 1:\n{deck1}\n\nPlayer 2:\n{deck2}"
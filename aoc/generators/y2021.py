@@ -0,0 +1,22 @@
+import random
+
+from aoc.generators import generator
+
+
+@generator(2021, 1)
+def depths(size: int, rng: random.Random) -> str:
+    depth = rng.randint(100, 200)
+    readings = []
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-5, 10))
+        readings.append(str(depth))
+    return "\n".join(readings)
+
+
+@generator(2021, 2)
+def course(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        direction = rng.choices(["forward", "down", "up"], weights=[2, 2, 1])[0]
+        lines.append(f"{direction} {rng.randint(1, 9)}")
+    return "\n".join(lines)
@@ -0,0 +1,177 @@
+import random
+import string
+
+from aoc.generators import generator, grid
+
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+@generator(2023, 1)
+def calibration(size: int, rng: random.Random) -> str:
+    """``size`` lines of letters with digits and spelled out digits mixed in."""
+    lines = []
+    for _ in range(size):
+        pieces = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(2, 8)):
+            kind = rng.random()
+            if kind < 0.2:
+                pieces.append(str(rng.randint(1, 9)))
+            elif kind < 0.4:
+                pieces.append(rng.choice(DIGIT_WORDS))
+            else:
+                pieces.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 4))))
+        rng.shuffle(pieces)
+        lines.append("".join(pieces))
+    return "\n".join(lines)
+
+
+@generator(2023, 2)
+def cube_games(size: int, rng: random.Random) -> str:
+    games = []
+    for game_id in range(1, size + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        games.append(f"Game {game_id}: {'; '.join(draws)}")
+    return "\n".join(games)
+
+
+@generator(2023, 4)
+def scratchcards(size: int, rng: random.Random, winning: int = 10, have: int = 25) -> str:
+    """``size`` cards, none win copies of cards past the end of the table.
+
+    Most cards match few numbers, like the real input, otherwise the number of
+    copies grows too fast to count.
+
+    """
+    width = len(str(size))
+    cards = []
+    for card in range(1, size + 1):
+        numbers = rng.sample(range(1, 100), winning + have)
+        winning_nums = numbers[:winning]
+        weights = [8, 4, 2, 1, 1] + [0.2] * (winning - 4)
+        matches = min(rng.choices(range(winning + 1), weights=weights)[0], size - card)
+        your_nums = rng.sample(winning_nums, matches) + numbers[winning:winning + have - matches]
+        rng.shuffle(your_nums)
+        cards.append(
+            f"Card {card:>{width}}: "
+            + " ".join(f"{n:>2}" for n in winning_nums)
+            + " | "
+            + " ".join(f"{n:>2}" for n in your_nums)
+        )
+    return "\n".join(cards)
+
+
+ALMANAC_MAPS = [
+    "seed-to-soil", "soil-to-fertilizer", "fertilizer-to-water", "water-to-light",
+    "light-to-temperature", "temperature-to-humidity", "humidity-to-location",
+]
+
+
+@generator(2023, 5)
+def seed_maps(size: int, rng: random.Random, seeds: int = 20, span: int = 4_000_000_000) -> str:
+    """An almanac with ``size`` ranges in every map.
+
+    Each map cuts ``[0, span)`` into ``size`` pieces and shuffles them, so it is
+    a bijection like the real ones.
+
+    """
+    starts = sorted(rng.sample(range(1, span), seeds))
+    seed_values = []
+    for i in range(0, seeds, 2):
+        start = starts[i]
+        seed_values += [start, rng.randint(1, starts[i + 1] - start)]
+    sections = ["seeds: " + " ".join(str(s) for s in seed_values)]
+
+    for name in ALMANAC_MAPS:
+        cuts = [0] + sorted(rng.sample(range(1, span), size - 1)) + [span]
+        pieces = [(lo, hi - lo) for lo, hi in zip(cuts, cuts[1:])]
+        order = list(range(size))
+        rng.shuffle(order)
+        dst = 0
+        lines = [f"{name} map:"]
+        for i in order:
+            src, length = pieces[i]
+            lines.append(f"{dst} {src} {length}")
+            dst += length
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+@generator(2023, 6)
+def races(size: int, rng: random.Random, count: int = 4) -> str:
+    """Races whose digits joined together make one race of about ``size`` ms.
+
+    Part 1 sees ``count`` short races, part 2 the single long one, so ``size``
+    controls the exhaustive part 2 search.
+
+    """
+    time = rng.randint(max(count, size // 2), max(count, size))
+    best = (time // 2) * (time - time // 2)
+    distance = rng.randint(best // 2, best - 1) if best > 1 else 0
+
+    def split(value: int) -> list[str]:
+        digits = str(value)
+        cuts = sorted(rng.sample(range(1, len(digits)), min(count, len(digits)) - 1))
+        return [digits[a:b] for a, b in zip([0] + cuts, cuts + [len(digits)])]
+
+    times, distances = split(time), split(distance)
+    n = min(len(times), len(distances))
+    times = times[:n - 1] + ["".join(times[n - 1:])]
+    distances = distances[:n - 1] + ["".join(distances[n - 1:])]
+    width = max(len(x) for x in times + distances) + 2
+    return (
+        "Time:    " + "".join(f"{t:>{width}}" for t in times) + "\n"
+        + "Distance:" + "".join(f"{d:>{width}}" for d in distances)
+    )
+
+
+@generator(2023, 7)
+def camel_cards(size: int, rng: random.Random) -> str:
+    hands = []
+    for _ in range(size):
+        hand = "".join(rng.choices("23456789TJQKA", k=5))
+        hands.append(f"{hand} {rng.randint(1, 1000)}")
+    return "\n".join(hands)
+
+
+@generator(2023, 9)
+def oasis_readings(size: int, rng: random.Random, length: int = 21) -> str:
+    """``size`` readings, each a polynomial of degree 5 or less sampled at 0..length-1."""
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 6))]
+        values = [sum(c * x ** p for p, c in enumerate(coefficients)) for x in range(length)]
+        lines.append(" ".join(str(v) for v in values))
+    return "\n".join(lines)
+
+
+@generator(2023, 11)
+def galaxies(size: int, rng: random.Random) -> str:
+    """A ``size`` by ``size`` image, with about one in twenty rows and columns empty."""
+    rows = [list(row) for row in grid(size, size, rng, ".#", weights=[50, 1]).split("\n")]
+    empty_cols = {x for x in range(size) if rng.random() < 0.05}
+    for y, row in enumerate(rows):
+        if rng.random() < 0.05:
+            rows[y] = ["."] * size
+            continue
+        for x in empty_cols:
+            row[x] = "."
+    return "\n".join("".join(row) for row in rows)
+
+
+@generator(2023, 12)
+def spring_records(size: int, rng: random.Random) -> str:
+    """``size`` records, damaged groups are read off a known layout before hiding parts of it."""
+    lines = []
+    for _ in range(size):
+        springs = "".join(rng.choices(".#", weights=[3, 2], k=rng.randint(6, 20)))
+        groups = [len(g) for g in springs.split(".") if g]
+        if not groups:
+            springs = "#" + springs[1:]
+            groups = [len(g) for g in springs.split(".") if g]
+        hidden = "".join("?" if rng.random() < 0.4 else s for s in springs)
+        lines.append(f"{hidden} {','.join(str(g) for g in groups)}")
+    return "\n".join(lines)
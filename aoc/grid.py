@@ -0,0 +1,228 @@
+"""Character grids as ``uint8`` NumPy arrays.
+
+Cells are indexed ``[y, x]`` like the array, but the methods take and return
+``(x, y)`` like the puzzles do. Transformations return a new ``Grid`` that
+usually shares memory with the old one, so they cost nothing until something
+is computed from them.
+
+    grid = Grid.parse(data)
+    trees = grid.mask("#")
+    start = grid.find("S")
+
+"""
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+
+# (dx, dy), clockwise from up
+ORTHOGONAL = ((0, -1), (1, 0), (0, 1), (-1, 0))
+DIAGONAL = ((1, -1), (1, 1), (-1, 1), (-1, -1))
+ALL = ORTHOGONAL + DIAGONAL
+
+
+def codes(chars: Union[str, bytes]) -> np.ndarray:
+    if isinstance(chars, str):
+        chars = chars.encode()
+    return np.frombuffer(chars, dtype=np.uint8)
+
+
+def shift(array: np.ndarray, dx: int, dy: int, fill=0) -> np.ndarray:
+    """``out[y, x] == array[y + dy, x + dx]``, with ``fill`` past the edges."""
+    out = np.full_like(array, fill)
+    height, width = array.shape[:2]
+    if abs(dx) >= width or abs(dy) >= height:
+        return out
+    src_y = slice(max(dy, 0), height + min(dy, 0))
+    src_x = slice(max(dx, 0), width + min(dx, 0))
+    dst_y = slice(max(-dy, 0), height + min(-dy, 0))
+    dst_x = slice(max(-dx, 0), width + min(-dx, 0))
+    out[dst_y, dst_x] = array[src_y, src_x]
+    return out
+
+
+class Grid:
+    def __init__(self, cells: np.ndarray):
+        if cells.ndim != 2:
+            raise ValueError(f"a grid needs a 2d array, got shape {cells.shape}")
+        self.cells = cells
+
+    @classmethod
+    def parse(cls, data: Union[str, bytes]) -> "Grid":
+        """Parse lines of equal length, surrounding whitespace is ignored."""
+        if isinstance(data, str):
+            data = data.encode()
+        rows = data.strip().split(b"\n")
+        rows = [row.rstrip(b"\r") for row in rows]
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError("grid rows are not all the same length")
+        cells = np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), width)
+        return cls(cells.copy())
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.cells.shape
+
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        x, y = pos
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def char(self, x: int, y: int) -> str:
+        return chr(self.cells[y, x])
+
+    def get(self, x: int, y: int, default: Optional[str] = None) -> Optional[str]:
+        """The character at ``(x, y)``, or ``default`` off the grid (no wrapping around)."""
+        if (x, y) not in self:
+            return default
+        return chr(self.cells[y, x])
+
+    def row(self, y: int) -> np.ndarray:
+        return self.cells[y]
+
+    def col(self, x: int) -> np.ndarray:
+        return self.cells[:, x]
+
+    def rows(self) -> Iterator[str]:
+        for row in self.cells:
+            yield row.tobytes().decode()
+
+    def __str__(self):
+        return "\n".join(self.rows())
+
+    def __eq__(self, other):
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return np.array_equal(self.cells, other.cells)
+
+    def __getitem__(self, key: tuple[slice, slice]) -> "Grid":
+        """A view of part of the grid, sliced like the array: ``grid[y0:y1, x0:x1]``."""
+        return Grid(self.cells[key])
+
+    def mask(self, chars: Union[str, bytes]) -> np.ndarray:
+        """Boolean array of the cells holding any of ``chars``."""
+        chars = codes(chars)
+        if len(chars) == 1:
+            return self.cells == chars[0]
+        return np.isin(self.cells, chars)
+
+    def find_all(self, chars: Union[str, bytes]) -> np.ndarray:
+        """``(n, 2)`` array of the ``(x, y)`` of cells holding any of ``chars``, row by row."""
+        ys, xs = np.nonzero(self.mask(chars))
+        return np.column_stack((xs, ys))
+
+    def find(self, char: str) -> tuple[int, int]:
+        found = self.find_all(char)
+        if not len(found):
+            raise ValueError(f"{char!r} is not in the grid")
+        x, y = found[0]
+        return int(x), int(y)
+
+    def neighbors(self, x: int, y: int, diagonal: bool = False) -> list[tuple[int, int]]:
+        offsets = ALL if diagonal else ORTHOGONAL
+        return [(x + dx, y + dy) for dx, dy in offsets if (x + dx, y + dy) in self]
+
+    @staticmethod
+    def neighbor_values(
+        values: np.ndarray, xs: np.ndarray, ys: np.ndarray, fill=-1, diagonal: bool = True,
+    ) -> np.ndarray:
+        """``(n, 8)`` (or ``(n, 4)``) array of ``values`` around each ``(xs[i], ys[i])``.
+
+        ``values`` is any array the shape of the grid, ``fill`` stands in for
+        the neighbours that are off the edge.
+
+        """
+        offsets = ALL if diagonal else ORTHOGONAL
+        height, width = values.shape
+        out = np.full((len(xs), len(offsets)), fill, dtype=values.dtype)
+        for i, (dx, dy) in enumerate(offsets):
+            nx, ny = xs + dx, ys + dy
+            inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+            out[inside, i] = values[ny[inside], nx[inside]]
+        return out
+
+    @staticmethod
+    def neighbor_count(mask: np.ndarray, diagonal: bool = True) -> np.ndarray:
+        """How many of each cell's neighbours are set in ``mask``."""
+        offsets = ALL if diagonal else ORTHOGONAL
+        count = np.zeros(mask.shape, dtype=np.uint8)
+        for dx, dy in offsets:
+            count += shift(mask, dx, dy, False)
+        return count
+
+    @staticmethod
+    def dilate(mask: np.ndarray, diagonal: bool = True) -> np.ndarray:
+        """``mask`` grown by one cell in every direction."""
+        offsets = ALL if diagonal else ORTHOGONAL
+        out = mask.copy()
+        for dx, dy in offsets:
+            out |= shift(mask, dx, dy, False)
+        return out
+
+    def rotate(self, turns: int = 1) -> "Grid":
+        """Rotated clockwise by ``turns`` quarter turns."""
+        return Grid(np.rot90(self.cells, -turns))
+
+    def flip_x(self) -> "Grid":
+        """Mirrored left to right."""
+        return Grid(self.cells[:, ::-1])
+
+    def flip_y(self) -> "Grid":
+        """Mirrored top to bottom."""
+        return Grid(self.cells[::-1])
+
+    def orientations(self) -> Iterator["Grid"]:
+        """The 8 rotations and reflections."""
+        for grid in (self, self.flip_x()):
+            for turns in range(4):
+                yield grid.rotate(turns)
+
+
+TEST_GRID = """\
+#.S
+..#
+.##
+"""
+
+
+def test_parse_and_lookup():
+    grid = Grid.parse(TEST_GRID)
+    assert grid.shape == (3, 3)
+    assert grid.char(2, 0) == "S"
+    assert grid.get(3, 0) is None and grid.get(-1, 0) is None
+    assert grid.find("S") == (2, 0)
+    assert grid.find_all("#").tolist() == [[0, 0], [2, 1], [1, 2], [2, 2]]
+    assert str(grid) == TEST_GRID.strip()
+    assert grid.row(1).tobytes() == b"..#"
+    assert grid.col(2).tobytes() == b"S##"
+    assert str(grid[1:, 1:]) == ".#\n##"
+    assert grid.neighbors(0, 0) == [(1, 0), (0, 1)]
+
+
+def test_transforms():
+    grid = Grid.parse("12\n34")
+    assert str(grid.rotate()) == "31\n42"
+    assert str(grid.rotate(2)) == "43\n21"
+    assert str(grid.flip_x()) == "21\n43"
+    assert str(grid.flip_y()) == "34\n12"
+    assert len({str(g) for g in grid.orientations()}) == 8
+
+
+def test_neighbors():
+    grid = Grid.parse(TEST_GRID)
+    walls = grid.mask("#")
+    assert grid.neighbor_count(walls).tolist() == [[0, 2, 1], [2, 4, 2], [1, 2, 2]]
+    assert grid.neighbor_count(walls, diagonal=False)[1, 1] == 2
+    assert grid.dilate(walls).all()
+    assert shift(np.arange(4).reshape(2, 2), 1, 0, -1).tolist() == [[1, -1], [3, -1]]
+    values = np.arange(9).reshape(3, 3)
+    around = Grid.neighbor_values(values, np.array([0]), np.array([0]))
+    assert sorted(around[0].tolist()) == [-1, -1, -1, -1, -1, 1, 3, 4]
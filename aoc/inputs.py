@@ -0,0 +1,220 @@
+"""Memory-mapped puzzle input, with line, record and grid views over the bytes.
+
+``Path.read_text().strip().split("\\n")`` decodes the whole file, copies it
+for ``strip()`` and again for the list of lines. Here the file is mapped
+once and the views are ``memoryview`` slices of the mapping, nothing is
+copied until a caller asks for it. ``int()`` accepts them directly:
+
+    with InputFile(path) as f:
+        numbers = [int(line) for line in f.lines()]
+
+Views must not be used after the file is closed.
+
+For input that doesn't fit in memory, or arrives on a pipe, ``read_records``
+reads blank line separated records from any file object a chunk at a time.
+
+"""
+import io
+import mmap
+import re
+from pathlib import Path
+from typing import AnyStr, Iterator, Optional, Protocol, Union
+
+whitespace = b" \t\r\n"
+blank_line_pattern = re.compile(rb"\n[ \t\r]*\n")
+text_blank_line_pattern = re.compile(r"\n[ \t\r]*\n")
+
+CHUNK_SIZE = 1 << 16
+
+
+class InputFile:
+    def __init__(self, path: Union[str, Path], strip: bool = True):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        if size:
+            self._mmap: Optional[mmap.mmap] = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(self._mmap)
+        else:
+            # mmap can't map an empty file
+            self._mmap = None
+            buffer = memoryview(b"")
+
+        # the same bounds that str.strip() would leave, without the copy
+        start, end = 0, len(buffer)
+        if strip:
+            while start < end and buffer[start] in whitespace:
+                start += 1
+            while end > start and buffer[end - 1] in whitespace:
+                end -= 1
+        self.start = start
+        self.end = end
+        self._buffer = buffer
+
+    @property
+    def buffer(self) -> memoryview:
+        return self._buffer[self.start:self.end]
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def find(self, sub: bytes, start: int) -> int:
+        """Position of ``sub`` at or after ``start`` before the end, -1 if it is not there."""
+        if self._mmap is None:
+            return -1
+        return self._mmap.find(sub, start, self.end)
+
+    def lines(self) -> Iterator[memoryview]:
+        """Each line, without the newline."""
+        pos = self.start
+        if pos == self.end:
+            return
+        while True:
+            i = self.find(b"\n", pos)
+            if i == -1:
+                yield self._buffer[pos:self.end]
+                return
+            yield self._buffer[pos:i]
+            pos = i + 1
+
+    def records(self) -> Iterator[memoryview]:
+        """Blocks of lines separated by blank lines, like ``split("\\n\\n")``."""
+        if self.start == self.end:
+            return
+        pos = self.start
+        for m in blank_line_pattern.finditer(self._mmap, self.start, self.end):
+            yield self._buffer[pos:m.start()]
+            pos = m.end()
+        yield self._buffer[pos:self.end]
+
+    def grid(self):
+        """A read-only ``(height, width)`` ``uint8`` NumPy view of a rectangular grid.
+
+        Rows are a stride apart in the mapping, so the newlines stay in memory
+        but are never part of the view.
+
+        """
+        import numpy as np
+
+        width = self.find(b"\n", self.start)
+        if width == -1:
+            width = len(self)
+        else:
+            width -= self.start
+        stride = width + 1
+        height = (len(self) + 1) // stride
+        if height * stride - 1 != len(self):
+            raise ValueError(f"{self.path} is not a rectangular grid {width} wide")
+        flat = np.frombuffer(self._buffer, dtype=np.uint8, count=len(self), offset=self.start)
+        return np.lib.stride_tricks.as_strided(
+            flat, shape=(height, width), strides=(stride, 1), writeable=False)
+
+    def text(self) -> str:
+        """The stripped contents as a ``str``, this one does copy."""
+        return str(self.buffer, "utf-8")
+
+    def close(self) -> None:
+        # views handed out keep the mapping alive, the file is closed regardless
+        self._buffer.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+        self._file.close()
+
+    def __enter__(self) -> "InputFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Readable(Protocol[AnyStr]):
+    def read(self, size: int = ...) -> AnyStr: ...
+
+
+def read_records(f: Readable[AnyStr], chunk_size: int = CHUNK_SIZE) -> Iterator[AnyStr]:
+    """Blocks of lines separated by blank lines, read ``chunk_size`` at a time.
+
+    ``f`` is anything with ``read()``: a file opened in text mode gives
+    ``str`` records, in binary mode or an ``mmap`` gives ``bytes``. Only the
+    record being read is held in memory, however big the input. Records come
+    out stripped and empty ones, from runs of blank lines, are skipped.
+
+    """
+    chunk = f.read(chunk_size)
+    if isinstance(chunk, str):
+        pattern, newline, empty = text_blank_line_pattern, "\n", ""
+    else:
+        pattern, newline, empty = blank_line_pattern, b"\n", b""
+    # the current record is ``parts`` and then ``tail``, which is kept apart
+    # because a separator may have started in it
+    parts = []
+    tail = empty
+    while chunk:
+        buffer = tail + chunk
+        pos = 0
+        for m in pattern.finditer(buffer):
+            record = (empty.join(parts) + buffer[pos:m.start()]).strip()
+            parts = []
+            if record:
+                yield record
+            pos = m.end()
+        rest = buffer[pos:]
+        # a separator that is cut off by the end of the chunk is a newline and
+        # whitespace, anything before it is settled
+        last = rest.rfind(newline)
+        split = last if last != -1 and not rest[last + 1:].strip() else len(rest)
+        if split:
+            parts.append(rest[:split])
+        tail = rest[split:]
+        chunk = f.read(chunk_size)
+    record = (empty.join(parts) + tail).strip()
+    if record:
+        yield record
+
+
+def test_views(tmp_path):
+    path = tmp_path / "input"
+    path.write_bytes(b"\n12\n-3\n\n45\n6\n\n")
+    with InputFile(path) as f:
+        assert [bytes(line) for line in f.lines()] == [b"12", b"-3", b"", b"45", b"6"]
+        assert [int(line) for line in f.lines() if line] == [12, -3, 45, 6]
+        assert [bytes(r) for r in f.records()] == [b"12\n-3", b"45\n6"]
+        assert f.text() == "12\n-3\n\n45\n6"
+
+
+def test_grid(tmp_path):
+    path = tmp_path / "input"
+    path.write_bytes(b"#..\n.#.\n..#\n")
+    with InputFile(path) as f:
+        grid = f.grid()
+        assert grid.shape == (3, 3)
+        assert (grid == ord("#")).sum() == 3
+        assert grid[2, 2] == ord("#")
+
+
+def test_empty(tmp_path):
+    path = tmp_path / "input"
+    path.write_bytes(b"")
+    with InputFile(path) as f:
+        assert list(f.lines()) == []
+        assert list(f.records()) == []
+        assert f.text() == ""
+
+
+def test_read_records(tmp_path):
+    data = "\n a\nbc\n\nd\r\n \r\n\n\n  \nef gh\nij\n\n\n"
+    expected = ["a\nbc", "d", "ef gh\nij"]
+    path = tmp_path / "input"
+    path.write_bytes(data.encode())
+    # small chunks, so that records and separators are cut at every point
+    for chunk_size in (1, 2, 3, 5, 64):
+        assert list(read_records(io.StringIO(data), chunk_size)) == expected
+        with open(path, "rb") as f:
+            assert list(read_records(f, chunk_size)) == [r.encode() for r in expected]
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            assert list(read_records(m, chunk_size)) == [r.encode() for r in expected]
+        assert list(read_records(io.StringIO(""), chunk_size)) == []
@@ -0,0 +1,237 @@
+"""Peak memory of a block of code, with tracemalloc or by sampling the RSS.
+
+    with measure("tracemalloc") as report:
+        part2(data)
+    print(report)
+    for site in report.top:
+        print(site)
+
+tracemalloc sees every Python allocation, so it can also say where the
+memory at the peak was allocated and how many blocks were live, but it
+slows the code down severalfold. Sampling the resident set size costs next
+to nothing but only sees the process as a whole: memory the allocator kept
+from earlier work hides new allocations, and anything shorter than the
+sampling interval can be missed.
+
+The peak itself is exact with tracemalloc, the allocation sites come from a
+snapshot taken by a sampling thread whenever the peak grows, so they describe
+the memory at (or very close to) the peak even if it was freed again before
+the end. A spike that comes and goes between two samples can still be missed.
+
+"""
+import contextlib
+import os
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+MODES = ("tracemalloc", "rss")
+
+# take a new tracemalloc snapshot whenever the peak grows this much past the
+# memory in use at the last one, so the one kept is from close to the peak
+# without paying for a snapshot on every sample
+SNAPSHOT_GROWTH = 1.25
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+@dataclass
+class Site:
+    location: str
+    size: int
+    count: int
+
+    def __str__(self):
+        return f"{format_bytes(self.size)} in {self.count} blocks at {self.location}"
+
+
+@dataclass
+class MemoryReport:
+    mode: str
+    peak: int = 0
+    # live blocks at the peak, only tracemalloc counts them
+    blocks: Optional[int] = None
+    top: list[Site] = field(default_factory=list)
+
+    def __str__(self):
+        s = f"peak {format_bytes(self.peak)}"
+        if self.blocks is not None:
+            s += f" in {self.blocks} blocks"
+        return s
+
+
+def rss() -> int:
+    """Resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # not the current size but the peak so far, kilobytes except on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, sample: Callable[[], None], interval: float):
+        super().__init__(daemon=True)
+        self._sample = sample
+        self._interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self._interval):
+            self._sample()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+# the measuring itself, and the runner calling the part, are not the part's memory
+_ignored = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, os.path.join(os.path.dirname(__file__), "runner.py")),
+]
+
+
+def _sites(snapshot: tracemalloc.Snapshot, top: int) -> tuple[int, list[Site]]:
+    stats = snapshot.filter_traces(_ignored).statistics("lineno")
+    blocks = sum(stat.count for stat in stats)
+    sites = [
+        Site(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+        for stat in stats[:top]
+    ]
+    return blocks, sites
+
+
+@contextlib.contextmanager
+def measure(mode: str = "tracemalloc", top: int = 3, interval: float = 0.005,
+            ) -> Iterator[MemoryReport]:
+    """Measure the code in the ``with`` block, the report is filled in when it exits."""
+    if mode not in MODES:
+        raise ValueError(f"unknown memory mode {mode!r}, expected one of {MODES}")
+    report = MemoryReport(mode)
+
+    if mode == "rss":
+        baseline = rss()
+        high = [baseline]
+
+        def sample():
+            high[0] = max(high[0], rss())
+
+        sampler = _Sampler(sample, interval)
+        sampler.start()
+        try:
+            yield report
+        finally:
+            sampler.stop()
+            sample()
+            report.peak = max(0, high[0] - baseline)
+        return
+
+    kept = {"size": -1, "snapshot": None}
+
+    def snapshot(growth: float = SNAPSHOT_GROWTH):
+        # the peak only says how much memory there was, so snapshot while the
+        # memory that made it is still around, which is when the peak moves
+        current, peak = tracemalloc.get_traced_memory()
+        still_there = current * SNAPSHOT_GROWTH >= peak
+        if kept["snapshot"] is None or peak > kept["size"] * growth and still_there:
+            kept["snapshot"] = tracemalloc.take_snapshot()
+            kept["size"] = current
+
+    # set up before tracing starts, to keep it out of the report
+    sampler = _Sampler(snapshot, interval)
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.clear_traces()
+    else:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    sampler.start()
+    try:
+        yield report
+    finally:
+        sampler.stop()
+        # memory still held at the end is the peak, or close to it
+        snapshot(1.0)
+        report.peak = tracemalloc.get_traced_memory()[1]
+        report.blocks, report.top = _sites(kept["snapshot"], top)
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+PART = """\
+import time
+
+
+def kept():
+    return [bytearray(1024) for _ in range(2000)]
+
+
+def freed():
+    block = bytearray(8 * 1024 * 1024)
+    # long enough for the sampler to see it before it's freed
+    time.sleep(0.05)
+    return len(block)
+"""
+
+
+def _load_part(tmp_path):
+    # a module of its own, allocations in this one are left out of the report
+    import importlib.util
+
+    path = tmp_path / "part.py"
+    path.write_text(PART)
+    spec = importlib.util.spec_from_file_location("part", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module, str(path)
+
+
+def test_tracemalloc(tmp_path):
+    part, path = _load_part(tmp_path)
+    with measure("tracemalloc") as report:
+        data = part.kept()
+    del data
+    assert report.peak >= 2000 * 1024
+    assert report.blocks is not None
+    assert report.top[0].location == f"{path}:5"
+    assert report.top[0].count >= 2000
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracemalloc_freed_peak(tmp_path):
+    part, path = _load_part(tmp_path)
+    with measure("tracemalloc") as report:
+        part.freed()
+    assert report.peak >= 8 * 1024 * 1024
+    assert report.top[0].location == f"{path}:9"
+    assert report.top[0].size >= 8 * 1024 * 1024
+    assert not any(site.location.startswith(__file__) for site in report.top)
+
+
+def test_rss():
+    with measure("rss") as report:
+        data = bytearray(64 * 1024 * 1024)
+        data[::4096] = b"x" * len(data[::4096])
+    assert report.peak > 32 * 1024 * 1024
+    assert report.top == [] and report.blocks is None
+
+
+def test_format_bytes():
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(1536) == "1.5 KiB"
+    assert format_bytes(3 * 1024 ** 3) == "3.0 GiB"
@@ -0,0 +1,156 @@
+"""Registry of solution modules, keyed by year and day.
+
+Discovery only reads and parses the source of the requested days, a module is
+not imported until one of its parts is about to run.
+
+"""
+import ast
+import importlib.util
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterable, Optional
+
+
+ROOT = Path(__file__).resolve().parent.parent
+PARTS = ("part1", "part2")
+INPUT_NAMES = ("input", "input.txt")
+
+year_pattern = re.compile(r"20\d\d")
+day_pattern = re.compile(r"day(\d\d)")
+
+# Days whose parts take parsed input instead of the raw puzzle text, mapped to
+# the module function that does the parsing. New days say so themselves with a
+# module level ``PARSER = parse``.
+PARSERS = {
+    (2020, 7): "create_bag_graph",
+    (2021, 1): "parse",
+    (2021, 2): "parse_input",
+}
+
+# Parts that are there but don't finish in any reasonable time, left out so a
+# run of the whole year doesn't hang on them.
+SKIPPED_PARTS = {
+    # brute force, experiment() has the cycle length approach
+    (2023, 8): {"part2"},
+}
+
+
+@dataclass
+class Solver:
+    year: int
+    day: int
+    path: Path
+    parts: tuple[str, ...]
+    _module: Optional[ModuleType] = field(default=None, repr=False, compare=False)
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}/day{self.day:02}"
+
+    @property
+    def module_name(self) -> str:
+        return f"aoc_{self.year}_day{self.day:02}_{self.path.stem}"
+
+    def input_path(self) -> Optional[Path]:
+        for name in INPUT_NAMES:
+            path = self.path.parent / name
+            if path.is_file():
+                return path
+        return None
+
+    def load(self) -> ModuleType:
+        """Import the solution module, only the first call pays for it."""
+        if self._module is None:
+            self._module = sys.modules.get(self.module_name)
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(self.module_name, self.path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[self.module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[self.module_name]
+                raise
+            self._module = module
+        return self._module
+
+    def part(self, name: str) -> Callable:
+        return getattr(self.load(), name)
+
+    def parser(self) -> Optional[Callable]:
+        name = PARSERS.get((self.year, self.day))
+        if name is None:
+            return getattr(self.load(), "PARSER", None)
+        return getattr(self.load(), name)
+
+
+def defined_parts(path: Path) -> tuple[str, ...]:
+    """Names of the parts defined at the top level of a module, without importing it."""
+    tree = ast.parse(path.read_text(), filename=str(path))
+    names = set()
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(t.id for t in node.targets if isinstance(t, ast.Name))
+    return tuple(part for part in PARTS if part in names)
+
+
+def find_solver(year: int, day: int, day_dir: Path) -> Optional[Solver]:
+    """Pick the module for a day.
+
+    Some days have more than one attempt (``report_repair1.py`` and
+    ``report_repair2.py``), prefer the one that has both parts and then the
+    later one, which is the cleaned up version.
+
+    """
+    candidates = []
+    for path in sorted(day_dir.glob("*.py")):
+        if path.name.startswith("test_"):
+            continue
+        skipped = SKIPPED_PARTS.get((year, day), set())
+        parts = tuple(part for part in defined_parts(path) if part not in skipped)
+        if parts:
+            candidates.append((len(parts), path.name, Solver(year, day, path, parts)))
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: c[:2])[2]
+
+
+def discover(
+    years: Optional[Iterable[int]] = None,
+    days: Optional[Iterable[tuple[int, int]]] = None,
+    root: Path = ROOT,
+) -> dict[tuple[int, int], Solver]:
+    """Find the solvers for the given years and (year, day) pairs, or everything."""
+    years = set(years or ())
+    days = set(days or ())
+    everything = not years and not days
+
+    registry = {}
+    for year_dir in sorted(root.iterdir()):
+        if not year_dir.is_dir() or not year_pattern.fullmatch(year_dir.name):
+            continue
+        year = int(year_dir.name)
+        for day_dir in sorted(year_dir.iterdir()):
+            m = day_pattern.fullmatch(day_dir.name)
+            if not m or not day_dir.is_dir():
+                continue
+            day = int(m.groups()[0])
+            if not (everything or year in years or (year, day) in days):
+                continue
+            solver = find_solver(year, day, day_dir)
+            if solver is not None:
+                registry[(year, day)] = solver
+    return registry
+
+
+def test_skipped_parts(tmp_path):
+    day_dir = tmp_path / "2023" / "day08"
+    day_dir.mkdir(parents=True)
+    (day_dir / "day08.py").write_text("def part1(data):\n    pass\n\n\n"
+                                      "def part2(data):\n    pass\n")
+    assert discover(root=tmp_path)[(2023, 8)].parts == ("part1",)
@@ -0,0 +1,291 @@
+"""Run solutions through the registry, in a single process.
+
+    python -m aoc                  # everything
+    python -m aoc 2020 2023/11     # a year, a single day
+    python -m aoc 2020/day08 -p 2  # only part 2
+    python -m aoc -j               # spread the parts over every core
+    python -m aoc 2023 --trace t.json  # phase timings for chrome://tracing
+    python -m aoc 2020/23 --no-cache   # solve again even if the answer is cached
+    python -m aoc 2020 --memory --budget 100  # peak memory, flag parts over 100 MiB
+
+"""
+import argparse
+import contextlib
+import inspect
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from aoc import timing
+from aoc.cache import Cache
+from aoc.memory import MODES, MemoryReport, format_bytes, measure
+from aoc.registry import PARTS, Solver, discover
+
+
+@dataclass
+class Result:
+    key: str
+    part: str
+    answer: Any = None
+    elapsed: float = 0.0
+    cpu: float = 0.0
+    output: str = ""
+    error: Optional[str] = None
+    skipped: bool = False
+    cached: bool = False
+    memory: Optional[MemoryReport] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+    def __str__(self):
+        if self.skipped:
+            return f"{self.key} {self.part}: skipped ({self.error})"
+        if self.error is not None:
+            return f"{self.key} {self.part}: ERROR {self.error}"
+        if self.cached:
+            return f"{self.key} {self.part}: {self.answer}  (cached)"
+        memory = f", {self.memory}" if self.memory is not None else ""
+        return (
+            f"{self.key} {self.part}: {self.answer}  "
+            f"({self.elapsed*1000:.3f} ms, cpu {self.cpu*1000:.3f} ms{memory})"
+        )
+
+
+def parse_target(target: str) -> tuple[int, Optional[int]]:
+    """Turn ``2020``, ``2020/8`` or ``2020/day08`` into ``(year, day)``."""
+    year, _, day = target.strip("/").partition("/")
+    if not day:
+        return int(year), None
+    return int(year), int(day.removeprefix("day"))
+
+
+def takes_input(func) -> bool:
+    """The 2022 parts take no arguments and read the input file themselves."""
+    return bool(inspect.signature(func).parameters)
+
+
+def read_input(solver: Solver) -> Optional[str]:
+    path = solver.input_path()
+    if path is None:
+        return None
+    return path.read_text()
+
+
+class MissingInputError(Exception):
+    pass
+
+
+def prepare_args(solver: Solver, func, data: Optional[str]) -> tuple:
+    """Arguments for a part, parsing the input for the days that need it."""
+    if not takes_input(func):
+        return ()
+    if data is None:
+        raise MissingInputError("no input file")
+    parser = solver.parser()
+    return (parser(data) if parser else data,)
+
+
+def call_quietly(func, args: tuple) -> tuple[Any, str]:
+    """Call a part, returning its answer and whatever it printed."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        answer = func(*args)
+    return answer, out.getvalue()
+
+
+def answer_from(answer: Any, output: str) -> Any:
+    """Many of the parts print their answer instead of returning it."""
+    return answer if answer is not None else (output.strip() or None)
+
+
+def run_part(
+    solver: Solver, part: str, data: Optional[str], cache: Optional[Cache] = None,
+    memory: Optional[str] = None,
+) -> Result:
+    """Run one part, capturing what it prints, unless the cache has its answer.
+
+    With ``memory`` (one of ``aoc.memory.MODES``) the peak memory of parsing
+    and solving is measured too.
+
+    """
+    result = Result(solver.key, part)
+    key = None
+    try:
+        if cache is not None:
+            key = cache.key(solver, part, data)
+            entry = cache.get(key)
+            if entry is not None:
+                result.answer = entry["answer"]
+                result.output = entry["output"]
+                result.cached = True
+                return result
+        with timing.phase(part):
+            func = solver.part(part)
+            profiler = measure(memory) if memory else contextlib.nullcontext()
+            with profiler as report:
+                with timing.phase("parse"):
+                    args = prepare_args(solver, func, data)
+                with timing.phase("solve"):
+                    start = time.perf_counter()
+                    cpu_start = time.process_time()
+                    answer, result.output = call_quietly(func, args)
+                    result.cpu = time.process_time() - cpu_start
+                    result.elapsed = time.perf_counter() - start
+            result.memory = report
+    except MissingInputError as err:
+        result.skipped = True
+        result.error = str(err)
+        return result
+    except Exception as err:
+        result.error = f"{err.__class__.__name__}: {err}"
+        result.output = traceback.format_exc()
+        return result
+    result.answer = answer_from(answer, result.output)
+    if key is not None:
+        cache.put(key, result.answer, result.output, result.elapsed)
+    return result
+
+
+def run(
+    solvers: Iterable[Solver], parts: Iterable[str] = PARTS, cache: Optional[Cache] = None,
+    memory: Optional[str] = None,
+) -> Iterator[Result]:
+    parts = tuple(parts)
+    for solver in solvers:
+        with timing.phase(solver.key):
+            with timing.phase("read"):
+                data = read_input(solver)
+            for part in parts:
+                if part in solver.parts:
+                    yield run_part(solver, part, data, cache, memory)
+
+
+def _run_task(
+    year: int, day: int, path: Path, parts: tuple[str, ...], part: str,
+    cache: Optional[Cache] = None, memory: Optional[str] = None,
+) -> Result:
+    """Runs in a worker process, which imports the module and reads the input itself."""
+    solver = Solver(year, day, path, parts)
+    return run_part(solver, part, read_input(solver), cache, memory)
+
+
+def run_parallel(
+    solvers: Iterable[Solver], parts: Iterable[str] = PARTS, workers: Optional[int] = None,
+    cache: Optional[Cache] = None, memory: Optional[str] = None,
+) -> Iterator[Result]:
+    """Like ``run``, but every part is a task in a process pool.
+
+    Results come back in the same order as ``run`` no matter which finishes
+    first. ``workers`` defaults to the number of CPUs.
+
+    """
+    parts = tuple(parts)
+    tasks = [
+        (solver, part)
+        for solver in solvers
+        for part in parts
+        if part in solver.parts
+    ]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [
+            pool.submit(
+                _run_task, solver.year, solver.day, solver.path, solver.parts, part, cache,
+                memory)
+            for solver, part in tasks
+        ]
+        for (solver, part), future in zip(tasks, futures):
+            try:
+                yield future.result()
+            except Exception as err:  # the worker died, e.g. BrokenProcessPool
+                yield Result(solver.key, part, error=f"{err.__class__.__name__}: {err}")
+
+
+def select(targets: Iterable[str]) -> list[Solver]:
+    years = []
+    days = []
+    for target in targets:
+        year, day = parse_target(target)
+        if day is None:
+            years.append(year)
+        else:
+            days.append((year, day))
+    registry = discover(years=years, days=days)
+    return [registry[key] for key in sorted(registry)]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc", description=__doc__.split("\n")[0])
+    parser.add_argument("targets", nargs="*", help="year, year/day or year/dayNN (default: all)")
+    parser.add_argument("-p", "--part", type=int, choices=(1, 2), help="only run this part")
+    parser.add_argument(
+        "-j", "--jobs", type=int, nargs="?", const=0,
+        help="run the parts in this many processes (default without a number: one per CPU)")
+    parser.add_argument(
+        "--trace", type=Path,
+        help="write the read, parse and solve phases to this file in the Chrome trace format")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="solve every part, ignoring cached answers")
+    parser.add_argument(
+        "--memory", nargs="?", const="tracemalloc", choices=MODES,
+        help="measure the peak memory of every part (default: tracemalloc, which also shows "
+             "the top allocation sites, rss is cheaper but coarser)")
+    parser.add_argument(
+        "--budget", type=float, metavar="MIB",
+        help="flag and fail the parts whose peak memory is over this many MiB (implies --memory)")
+    args = parser.parse_args(argv)
+    if args.budget is not None and args.memory is None:
+        args.memory = "tracemalloc"
+    if args.trace and args.jobs is not None:
+        parser.error("--trace needs the parts to run in this process, it can't be used with -j")
+
+    solvers = select(args.targets)
+    if not solvers:
+        print("No solutions found", file=sys.stderr)
+        return 1
+    parts = (f"part{args.part}",) if args.part else PARTS
+
+    if args.trace:
+        timing.enable()
+    # cached answers have no memory figures to report
+    cache = None if args.no_cache or args.memory else Cache()
+    if args.jobs is None:
+        results = run(solvers, parts, cache, args.memory)
+    else:
+        results = run_parallel(
+            solvers, parts, workers=args.jobs or None, cache=cache, memory=args.memory)
+    budget = None if args.budget is None else int(args.budget * 1024 * 1024)
+
+    failed = False
+    start = time.perf_counter()
+    total = 0.0
+    for result in results:
+        print(result)
+        total += result.elapsed
+        failed = failed or result.error is not None and not result.skipped
+        if result.memory is not None:
+            for site in result.memory.top:
+                print(f"    {site}")
+            if budget is not None and result.memory.peak > budget:
+                print(f"    OVER BUDGET: {format_bytes(result.memory.peak)} > "
+                      f"{format_bytes(budget)}")
+                failed = True
+    if args.jobs is not None:
+        print(f"wall {time.perf_counter() - start:.3f} s, sum of parts {total:.3f} s")
+    if args.trace:
+        timing.dump(args.trace, chrome=True)
+        timing.disable()
+    return 1 if failed else 0
+
+
+def test_parse_target():
+    assert parse_target("2020") == (2020, None)
+    assert parse_target("2020/8") == (2020, 8)
+    assert parse_target("2023/day11/") == (2023, 11)
@@ -0,0 +1,181 @@
+"""Nested phase timings, for seeing where a day spends its time.
+
+    timing.enable()
+    with timing.phase("read"):
+        data = read_input()
+    with timing.phase("part1"):
+        part1(data)
+    print(timing.summary())
+
+Functions can be timed with ``@timing.timed()``. Until ``enable()`` is called
+``phase()`` hands back a shared do-nothing context manager and ``timed``
+functions are called straight through, so the hooks can stay in the code.
+
+Recorded phases export as plain JSON or in the Chrome trace event format,
+which chrome://tracing and https://ui.perfetto.dev can open.
+
+"""
+import functools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NOOP = _Noop()
+
+
+class Recorder:
+    def __init__(self):
+        # [name, depth, start ns, elapsed ns], in the order the phases started
+        self.events: list[list] = []
+        self.depth = 0
+        self.origin = time.perf_counter_ns()
+
+
+class _Phase:
+    __slots__ = ("recorder", "name", "event")
+
+    def __init__(self, recorder: Recorder, name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        recorder = self.recorder
+        self.event = [self.name, recorder.depth, time.perf_counter_ns(), 0]
+        recorder.events.append(self.event)
+        recorder.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.event[3] = time.perf_counter_ns() - self.event[2]
+        self.recorder.depth -= 1
+        return False
+
+
+_recorder: Optional[Recorder] = None
+
+
+def enable() -> None:
+    """Start recording, dropping anything recorded before."""
+    global _recorder
+    _recorder = Recorder()
+
+
+def disable() -> None:
+    global _recorder
+    _recorder = None
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+def phase(name: str):
+    """Context manager timing the code inside it as ``name``."""
+    recorder = _recorder
+    if recorder is None:
+        return NOOP
+    return _Phase(recorder, name)
+
+
+def timed(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of a function, as ``name`` or the function's name."""
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            with _Phase(recorder, label):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def events() -> list[dict]:
+    """Recorded phases, times in seconds from when recording started."""
+    if _recorder is None:
+        return []
+    origin = _recorder.origin
+    return [
+        {"name": name, "depth": depth, "start": (start - origin) / 1e9, "elapsed": elapsed / 1e9}
+        for name, depth, start, elapsed in _recorder.events
+    ]
+
+
+def chrome_trace() -> dict:
+    pid = os.getpid()
+    return {
+        "traceEvents": [
+            {
+                "name": e["name"],
+                "ph": "X",
+                "ts": e["start"] * 1e6,
+                "dur": e["elapsed"] * 1e6,
+                "pid": pid,
+                "tid": 0,
+            }
+            for e in events()
+        ],
+        "displayTimeUnit": "ms",
+    }
+
+
+def dump(path: Union[str, Path], chrome: bool = False) -> None:
+    data = chrome_trace() if chrome else {"events": events()}
+    Path(path).write_text(json.dumps(data, indent=1))
+
+
+def summary() -> str:
+    lines = []
+    for e in events():
+        indent = "  " * e["depth"]
+        lines.append(f"{indent}{e['name']:<{max(1, 24 - len(indent))}} {e['elapsed']*1000:10.4f} ms")
+    return "\n".join(lines)
+
+
+def test_nested_phases():
+    enable()
+    try:
+        with phase("read"):
+            pass
+        with phase("part1"):
+            with phase("parse"):
+                pass
+
+        @timed()
+        def solve():
+            return 42
+
+        with phase("part2"):
+            assert solve() == 42
+        names = [(e["name"], e["depth"]) for e in events()]
+        assert names == [
+            ("read", 0), ("part1", 0), ("parse", 1), ("part2", 0),
+            ("test_nested_phases.<locals>.solve", 1),
+        ]
+        assert all(e["elapsed"] >= 0 for e in events())
+        assert len(chrome_trace()["traceEvents"]) == 5
+    finally:
+        disable()
+
+
+def test_disabled():
+    assert phase("read") is NOOP
+    assert timed()(lambda: 1)() == 1
+    assert events() == []